@@ -0,0 +1,150 @@
+"""
+Contact archiving
+
+Moves contacts older than ARCHIVE_AFTER_DAYS from the hot contacts
+collection into a zstd-compressed cold collection, tagged with the month
+they were submitted. Archived contacts stay indexed by id and email.
+
+Each batch is upserted into the archive before it is deleted from the hot
+collection, so an interrupted run loses nothing and can simply be repeated.
+Per-day counts of archived contacts are kept alongside, incremented only
+for newly archived documents, so stats never have to scan the archive.
+
+The in-process job runs in every worker; a lease in the locks collection
+makes only one of them archive per interval.
+
+Usage: python archive.py [--older-than-days N]
+"""
+
+import asyncio
+import logging
+import os
+import uuid
+from collections import Counter
+from datetime import datetime, timedelta
+
+from pymongo import ReplaceOne, UpdateOne
+from pymongo.errors import CollectionInvalid, DuplicateKeyError
+
+from database import (
+    db, CONTACTS_COLLECTION, CONTACTS_ARCHIVE_COLLECTION, CONTACTS_ARCHIVE_COUNTS_COLLECTION,
+    LOCKS_COLLECTION
+)
+from stats import day_key, week_key
+
+# Archiving configuration
+ARCHIVE_AFTER_DAYS = int(os.environ.get('ARCHIVE_AFTER_DAYS', '180'))
+# Hours between runs of the in-process archiving job; 0 disables it
+ARCHIVE_INTERVAL_HOURS = float(os.environ.get('ARCHIVE_INTERVAL_HOURS', '0'))
+ARCHIVE_BATCH_SIZE = int(os.environ.get('ARCHIVE_BATCH_SIZE', '1000'))
+ARCHIVE_LEASE = "archive_contacts"
+
+logger = logging.getLogger(__name__)
+
+
+async def ensure_archive_collection(db):
+    """Create the compressed archive collection and its lookup indexes"""
+    try:
+        await db.create_collection(
+            CONTACTS_ARCHIVE_COLLECTION,
+            storageEngine={"wiredTiger": {"configString": "block_compressor=zstd"}},
+        )
+    except CollectionInvalid:
+        pass  # Already exists
+    await db[CONTACTS_ARCHIVE_COLLECTION].create_index([("tenant_id", 1), ("id", 1)], unique=True)
+    await db[CONTACTS_ARCHIVE_COLLECTION].create_index([("tenant_id", 1), ("email", 1)])
+    await db[CONTACTS_ARCHIVE_COLLECTION].create_index("archive_month")
+    await db[CONTACTS_ARCHIVE_COUNTS_COLLECTION].create_index([("tenant_id", 1), ("day", 1)], unique=True)
+    # Lets the archiver find old contacts across all tenants
+    await db[CONTACTS_COLLECTION].create_index("created_at")
+
+
+async def archive_contacts(db, older_than_days: int = ARCHIVE_AFTER_DAYS, batch_size: int = ARCHIVE_BATCH_SIZE) -> int:
+    """Move contacts created before the cutoff into the archive, returning how many moved"""
+    cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+    archived_at = datetime.utcnow()
+    moved = 0
+    while True:
+        batch = await db[CONTACTS_COLLECTION].find(
+            {"created_at": {"$lt": cutoff}}
+        ).sort("created_at", 1).limit(batch_size).to_list(batch_size)
+        if not batch:
+            break
+
+        result = await db[CONTACTS_ARCHIVE_COLLECTION].bulk_write([
+            ReplaceOne(
+                {"_id": doc["_id"]},
+                {**doc, "archive_month": doc["created_at"].strftime("%Y-%m"), "archived_at": archived_at},
+                upsert=True,
+            )
+            for doc in batch
+        ], ordered=False)
+        # Only count documents not archived by an earlier, interrupted run
+        await count_archived(db, [batch[index] for index in result.upserted_ids])
+        await db[CONTACTS_COLLECTION].delete_many({"_id": {"$in": [doc["_id"] for doc in batch]}})
+        moved += len(batch)
+
+    logger.info("Archived %d contacts created before %s", moved, cutoff.isoformat())
+    return moved
+
+
+async def count_archived(db, docs):
+    """Add archived contacts to the per-tenant, per-day archive counts"""
+    counts = Counter(
+        (doc["tenant_id"], day_key(doc["created_at"]), week_key(doc["created_at"])) for doc in docs
+    )
+    if counts:
+        await db[CONTACTS_ARCHIVE_COUNTS_COLLECTION].bulk_write([
+            UpdateOne(
+                {"tenant_id": tenant_id, "day": day},
+                {"$inc": {"count": count}, "$set": {"week": week}},
+                upsert=True,
+            )
+            for (tenant_id, day, week), count in counts.items()
+        ], ordered=False)
+
+
+async def acquire_lease(db, name: str, owner: str, seconds: float) -> bool:
+    """Take or renew a named lease, returning False while another owner holds it"""
+    now = datetime.utcnow()
+    try:
+        await db[LOCKS_COLLECTION].find_one_and_update(
+            {"_id": name, "$or": [{"owner": owner}, {"expires_at": {"$lt": now}}]},
+            {"$set": {"owner": owner, "expires_at": now + timedelta(seconds=seconds)}},
+            upsert=True,
+        )
+    except DuplicateKeyError:
+        return False
+    return True
+
+
+async def run_archive_job(db):
+    """Archive old contacts every ARCHIVE_INTERVAL_HOURS until cancelled.
+
+    The lease lasts one interval and is not released, so the other workers
+    skip this interval instead of re-running right after the holder.
+    """
+    owner = uuid.uuid4().hex
+    while True:
+        try:
+            if await acquire_lease(db, ARCHIVE_LEASE, owner, ARCHIVE_INTERVAL_HOURS * 3600):
+                await archive_contacts(db)
+        except Exception as e:
+            logger.error("Error archiving contacts: %s", e)
+        await asyncio.sleep(ARCHIVE_INTERVAL_HOURS * 3600)
+
+
+def main(older_than_days: int = ARCHIVE_AFTER_DAYS):
+    """Archive old contact submissions"""
+    async def run():
+        await ensure_archive_collection(db)
+        moved = await archive_contacts(db, older_than_days)
+        print(f"✅ Archived {moved} contacts")
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    # typer is only needed on the command line, not when server.py imports this module
+    import typer
+    typer.run(main)
@@ -0,0 +1,108 @@
+"""
+Logging overhead benchmark
+
+Measures the time the request path spends emitting one access log record
+with the synchronous stream handler the app used before, with the
+queue-based JSON handler, and with the queue handler under sampling.
+Each is run against a local file and against a sink that blocks on every
+write, as stdout piped to a slow log collector does.
+
+Usage: python bench_logging.py [requests]
+"""
+
+import logging
+import os
+import sys
+import tempfile
+import time
+
+import logging_config
+from logging_config import (
+    AccessLogSampler, RequestContext, request_context,
+    setup_logging, shutdown_logging
+)
+
+EXTRA = {
+    "method": "GET",
+    "path": "/api/projects",
+    "route": "/api/projects",
+    "status": 200,
+    "latency_ms": 3.214,
+    "db_time_ms": 1.872,
+    "db_calls": 1,
+}
+
+
+class SlowStream:
+    """File wrapper that blocks on each write like a backpressured pipe"""
+
+    def __init__(self, stream, delay: float = 0.0002):
+        self.stream = stream
+        self.delay = delay
+
+    def write(self, data):
+        time.sleep(self.delay)
+        return self.stream.write(data)
+
+    def flush(self):
+        self.stream.flush()
+
+
+def time_per_call(logger, count: int, sampler=None) -> float:
+    """Return microseconds per simulated request"""
+    start = time.perf_counter()
+    for _ in range(count):
+        if sampler is None or sampler.should_log():
+            logger.info("%s %s %s", "GET", "/api/projects", 200, extra=EXTRA)
+    return (time.perf_counter() - start) / count * 1e6
+
+
+def bench_sync(path: str, count: int, slow: bool = False) -> float:
+    logger = logging.getLogger("bench.sync")
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    with open(path, "a") as stream:
+        handler = logging.StreamHandler(SlowStream(stream) if slow else stream)
+        handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+        logger.addHandler(handler)
+        try:
+            return time_per_call(logger, count)
+        finally:
+            logger.removeHandler(handler)
+
+
+def bench_queue(path: str, count: int, slow: bool = False, sampler=None) -> float:
+    with open(path, "a") as stream:
+        setup_logging(SlowStream(stream) if slow else stream)
+        try:
+            return time_per_call(logging.getLogger("access"), count, sampler)
+        finally:
+            shutdown_logging()
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    request_context.set(RequestContext("bench"))
+    # Keep the queue large enough that no records are dropped
+    logging_config.LOG_QUEUE_SIZE = count + 1
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.log")
+        results = []
+        for sink, slow in (("file", False), ("blocking sink", True)):
+            results.append((sink, [
+                ("sync stream handler (text)", bench_sync(path, count, slow)),
+                ("queue handler (JSON)", bench_queue(path, count, slow)),
+                ("queue handler (JSON, sampled 10%)",
+                 bench_queue(path, count, slow, AccessLogSampler(full_rps=0, sample_rate=0.1))),
+            ]))
+
+    print(f"Logging overhead per request ({count} requests)")
+    for sink, rows in results:
+        print(f"{sink}:")
+        for name, micros in rows:
+            print(f"  {name:<36} {micros:8.2f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Response validation and serialization benchmark
+
+Compares, per list endpoint, the old path (ApiListResponse with untyped
+dicts, re-validated and encoded by FastAPI's serialize_response and
+JSONResponse) against the typed single-pass list_response, with and without
+validation, at 1k and 10k documents.
+
+Usage: python bench_serialization.py [repeats]
+"""
+
+import asyncio
+import sys
+import time
+import uuid
+from datetime import datetime
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from models import (
+    ApiListResponse, SkillCategoryOut, ProjectOut, ExperienceOut,
+    EducationOut, CertificationOut, ContactOut
+)
+from responses import list_response
+
+
+def base_doc(i: int) -> dict:
+    now = datetime.utcnow()
+    return {"id": str(uuid.uuid4()), "display_order": i, "created_at": now, "updated_at": now}
+
+
+DOC_FACTORIES = {
+    "/api/skills": (SkillCategoryOut, lambda i: {
+        **base_doc(i), "category": f"category-{i}",
+        "skills": ["JavaScript", "Python", "REST APIs", "ServiceNow", "Flow Designer"],
+    }),
+    "/api/projects": (ProjectOut, lambda i: {
+        **base_doc(i), "title": f"Project {i}", "category": "ServiceNow Enterprise",
+        "description": "Security and compliance automation for facility access management.",
+        "technologies": ["ServiceNow", "JavaScript", "UI Policies", "Business Rules", "MRVS"],
+        "features": ["Custom Service Portal widgets", "Automated approvals", "RBAC implementation"],
+        "status": "Production", "impact": "Reduced manual access management by 80%",
+    }),
+    "/api/experience": (ExperienceOut, lambda i: {
+        **base_doc(i), "company": f"Company {i}", "position": "ServiceNow Developer",
+        "duration": "2021 - Present", "location": "Remote",
+        "achievements": ["Built service portal widgets", "Automated role provisioning"],
+    }),
+    "/api/education": (EducationOut, lambda i: {
+        **base_doc(i), "institution": f"University {i}", "degree": "BTech",
+        "duration": "2016 - 2020", "location": "Delhi, India", "status": "Completed",
+    }),
+    "/api/certifications": (CertificationOut, lambda i: {
+        **base_doc(i), "name": f"Certification {i}", "issuer": "ServiceNow", "date_obtained": None,
+    }),
+    "/api/contacts": (ContactOut, lambda i: {
+        **base_doc(i), "name": f"Visitor {i}", "email": f"visitor{i}@example.com",
+        "subject": "Hello", "message": "I would like to discuss a project.", "is_read": False,
+    }),
+}
+
+UNTYPED_FIELD = create_response_field(name="Response_bench", type_=ApiListResponse)
+
+
+def untyped_path(docs):
+    response = ApiListResponse(success=True, data=docs)
+    content = asyncio.run(serialize_response(field=UNTYPED_FIELD, response_content=response))
+    return JSONResponse(content).body
+
+
+def best_of(fn, repeats: int) -> float:
+    """Return the best wall time in milliseconds"""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    print(f"{'endpoint':<22}{'docs':>7}{'untyped':>12}{'typed':>12}{'trusted':>12}   (ms, best of {repeats})")
+    for endpoint, (model, factory) in DOC_FACTORIES.items():
+        for size in (1000, 10000):
+            docs = [factory(i) for i in range(size)]
+            untyped = best_of(lambda: untyped_path(docs), repeats)
+            typed = best_of(lambda: list_response(model, docs).body, repeats)
+            trusted = best_of(lambda: list_response(model, docs, trusted=True).body, repeats)
+            print(f"{endpoint:<22}{size:>7}{untyped:>12.2f}{typed:>12.2f}{trusted:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
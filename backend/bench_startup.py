@@ -0,0 +1,93 @@
+"""
+Cold start benchmark
+
+Starts fresh interpreters and reports, per run:
+  - import time per module for `import server`, from python -X importtime
+    (cumulative, so a module includes everything it imported first)
+  - the startup report phases: imported, app_created, lifespan_ready and
+    first_request, the last one being a GET /api/ through the ASGI app
+
+Needs a reachable Mongo at MONGO_URL: lifespan creates the required unique
+indexes before the app is ready. The remaining indexes are created in the
+background.
+
+Usage: python bench_startup.py [runs]
+"""
+
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).parent
+LOCAL_MODULES = {path.stem for path in BACKEND_DIR.glob("*.py")}
+THIRD_PARTY = {"fastapi", "starlette", "pydantic", "pymongo", "motor", "dotenv", "pandas", "typer", "numpy"}
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s+)(\S+)")
+
+FIRST_REQUEST = """
+import asyncio, json
+import httpx
+import server
+from startup import startup_report
+
+async def main():
+    app = server.create_app()
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            (await client.get("/api/")).raise_for_status()
+    print(json.dumps(startup_report.as_dict()))
+
+asyncio.run(main())
+"""
+
+
+def env() -> dict:
+    return {**os.environ, "MONGO_URL": os.environ.get("MONGO_URL", "mongodb://localhost:27017"),
+            "DB_NAME": os.environ.get("DB_NAME", "portfolio_bench"), "LOG_LEVEL": "WARNING"}
+
+
+def import_times() -> dict:
+    """Cumulative import time in ms for local modules and notable dependencies"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import server"],
+        cwd=BACKEND_DIR, env=env(), capture_output=True, text=True, check=True,
+    )
+    times = {}
+    for match in IMPORTTIME_LINE.finditer(result.stderr):
+        cumulative, name = int(match.group(2)), match.group(4)
+        if name in LOCAL_MODULES or name in THIRD_PARTY:
+            times[name] = cumulative / 1000
+    return times
+
+
+def startup_phases() -> dict:
+    result = subprocess.run(
+        [sys.executable, "-c", FIRST_REQUEST],
+        cwd=BACKEND_DIR, env=env(), capture_output=True, text=True, check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+    imports = [import_times() for _ in range(runs)]
+    print(f"Import time per module, median of {runs} runs (cumulative ms)")
+    modules = sorted({name for run in imports for name in run},
+                     key=lambda name: -statistics.median(run.get(name, 0) for run in imports))
+    for name in modules:
+        print(f"  {name:<20} {statistics.median(run.get(name, 0) for run in imports):>8.1f}")
+    print(f"  {'(not imported)':<20} {', '.join(sorted(THIRD_PARTY - set(modules)))}")
+
+    phases = [startup_phases() for _ in range(runs)]
+    print(f"\nStartup phases, median of {runs} runs (ms since server import began)")
+    for phase in phases[0]:
+        print(f"  {phase:<20} {statistics.median(run[phase] for run in phases):>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
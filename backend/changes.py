@@ -0,0 +1,111 @@
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from database import (
+    SKILLS_COLLECTION, PROJECTS_COLLECTION, EXPERIENCE_COLLECTION,
+    EDUCATION_COLLECTION, CERTIFICATIONS_COLLECTION, TOMBSTONES_COLLECTION
+)
+
+# Deletions are remembered this long; older cursors must reload everything
+TOMBSTONE_RETENTION_DAYS = int(os.environ.get('TOMBSTONE_RETENTION_DAYS', '30'))
+# Returned versions trail the current time by this much, so writes that were
+# in flight during a sync are picked up again by the next one
+SYNC_SAFETY_WINDOW_MS = int(os.environ.get('SYNC_SAFETY_WINDOW_MS', '5000'))
+
+# Public collections included in the change feed, keyed by their field in ChangesOut
+SYNCED_COLLECTIONS = {
+    "skills": SKILLS_COLLECTION,
+    "projects": PROJECTS_COLLECTION,
+    "experience": EXPERIENCE_COLLECTION,
+    "education": EDUCATION_COLLECTION,
+    "certifications": CERTIFICATIONS_COLLECTION,
+}
+
+
+def to_version(value: datetime) -> int:
+    """Convert a naive UTC datetime to a version (milliseconds since the epoch)"""
+    return int(value.replace(tzinfo=timezone.utc).timestamp() * 1000)
+
+
+def from_version(version: int) -> datetime:
+    return datetime.fromtimestamp(version / 1000, timezone.utc).replace(tzinfo=None)
+
+
+def parse_since(since: Optional[str]) -> int:
+    """Accept a version number or an ISO 8601 timestamp.
+
+    Raises ValueError for malformed input and for versions before the epoch
+    or later than now, which no sync could have returned.
+    """
+    if not since:
+        return 0
+    if since.isdigit():
+        version = int(since)
+    else:
+        parsed = datetime.fromisoformat(since.replace("Z", "+00:00"))
+        if parsed.tzinfo is not None:
+            parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+        version = to_version(parsed)
+    if not 0 <= version <= to_version(datetime.utcnow()):
+        raise ValueError(f"Version {since} is out of range")
+    return version
+
+
+async def record_deletion(db, collection: str, tenant_id: str, doc_id: str):
+    """Leave a tombstone so syncing clients learn about a deleted document"""
+    await db[TOMBSTONES_COLLECTION].insert_one(
+        {"tenant_id": tenant_id, "collection": collection, "id": doc_id, "deleted_at": datetime.utcnow()}
+    )
+
+
+async def record_deletions(db, collection: str, tenant_id: str, query: dict):
+    """Leave tombstones for every document of a tenant matching a query before it is deleted"""
+    now = datetime.utcnow()
+    tombstones = [
+        {"tenant_id": tenant_id, "collection": collection, "id": doc["id"], "deleted_at": now}
+        async for doc in db[collection].find({**query, "tenant_id": tenant_id}, {"_id": 0, "id": 1})
+    ]
+    if tombstones:
+        await db[TOMBSTONES_COLLECTION].insert_many(tombstones)
+
+
+async def get_changes(db, tenant_id: str, since: int, decode) -> dict:
+    """Collect a tenant's documents changed and deleted after ``since`` across synced collections.
+
+    ``decode(collection, docs)`` turns stored documents into their API shape.
+    """
+    started = datetime.utcnow()
+    retention_start = started - timedelta(days=TOMBSTONE_RETENTION_DAYS)
+    full_reload = since == 0 or from_version(since) < retention_start
+    query = {"tenant_id": tenant_id}
+    if not full_reload:
+        query["updated_at"] = {"$gt": from_version(since)}
+
+    result = {"full_reload": full_reload, "version": max(since, to_version(started) - SYNC_SAFETY_WINDOW_MS)}
+    deleted = {}
+    if not full_reload:
+        async for tombstone in db[TOMBSTONES_COLLECTION].find(
+            {"tenant_id": tenant_id, "deleted_at": {"$gt": from_version(since)}}, {"_id": 0}
+        ):
+            deleted.setdefault(tombstone["collection"], set()).add(tombstone["id"])
+
+    for field, collection in SYNCED_COLLECTIONS.items():
+        docs = await db[collection].find(query, {"_id": 0, "tenant_id": 0}).sort("updated_at", 1).to_list(None)
+        upserted_ids = {doc["id"] for doc in docs}
+        result[field] = {
+            "upserted": await decode(collection, docs),
+            "deleted": sorted(deleted.get(collection, set()) - upserted_ids),
+        }
+
+    return result
+
+
+async def ensure_change_indexes(db):
+    """Create the indexes backing the change feed"""
+    for collection in SYNCED_COLLECTIONS.values():
+        await db[collection].create_index([("tenant_id", 1), ("updated_at", 1)])
+    await db[TOMBSTONES_COLLECTION].create_index([("tenant_id", 1), ("deleted_at", 1)])
+    await db[TOMBSTONES_COLLECTION].create_index(
+        "deleted_at", expireAfterSeconds=TOMBSTONE_RETENTION_DAYS * 24 * 3600
+    )
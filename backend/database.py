@@ -1,4 +1,3 @@
-from motor.motor_asyncio import AsyncIOMotorClient
 import os
 from dotenv import load_dotenv
 from pathlib import Path
@@ -6,10 +5,37 @@ from pathlib import Path
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
-# MongoDB connection
-mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
-db = client[os.environ['DB_NAME']]
+from logging_config import db_time_listener
+from profiling import slow_query_log
+
+# MongoDB connection, created by init_db() at startup or on first use, so
+# importing this module does not construct a client (or resolve SRV records)
+_client = None
+_db = None
+
+def init_db():
+    """Create the Mongo client and database handle if they do not exist yet"""
+    global _client, _db
+    if _client is None:
+        from motor.motor_asyncio import AsyncIOMotorClient
+        _client = AsyncIOMotorClient(os.environ['MONGO_URL'], event_listeners=[slow_query_log, db_time_listener])
+        _db = _client[os.environ['DB_NAME']]
+    return _db
+
+def get_client():
+    init_db()
+    return _client
+
+class LazyDatabase:
+    """Stands in for the Motor database until the client is created"""
+
+    def __getattr__(self, name):
+        return getattr(init_db(), name)
+
+    def __getitem__(self, name):
+        return init_db()[name]
+
+db = LazyDatabase()
 
 # Collection names
 SKILLS_COLLECTION = "skills"
@@ -18,6 +44,14 @@ EXPERIENCE_COLLECTION = "experience"
 EDUCATION_COLLECTION = "education"
 CERTIFICATIONS_COLLECTION = "certifications"
 CONTACTS_COLLECTION = "contacts"
+CONTACTS_ARCHIVE_COLLECTION = "contacts_archive"
+CONTACTS_ARCHIVE_COUNTS_COLLECTION = "contacts_archive_counts"
+TAGS_COLLECTION = "tags"
+COUNTERS_COLLECTION = "counters"
+TOMBSTONES_COLLECTION = "tombstones"
+STATS_COLLECTION = "stats"
+CONTACT_DEDUP_COLLECTION = "contact_dedup"
+LOCKS_COLLECTION = "locks"
 
 # Database utility functions
 async def get_collection(collection_name: str):
@@ -26,4 +60,7 @@ async def get_collection(collection_name: str):
 
 async def close_db_connection():
     """Close database connection"""
-    client.close()
\ No newline at end of file
+    global _client, _db
+    if _client is not None:
+        _client.close()
+        _client = _db = None
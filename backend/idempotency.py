@@ -0,0 +1,184 @@
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, List, Optional, Tuple
+
+from pymongo.errors import DuplicateKeyError
+
+from database import CONTACT_DEDUP_COLLECTION
+
+# Deduplication configuration
+IDEMPOTENCY_KEY_TTL = int(os.environ.get('IDEMPOTENCY_KEY_TTL', str(24 * 3600)))
+CONTENT_DEDUP_WINDOW = int(os.environ.get('CONTENT_DEDUP_WINDOW', '600'))
+DEDUP_CACHE_SIZE = int(os.environ.get('DEDUP_CACHE_SIZE', '10000'))
+# How long a claim may stay pending before a retry can take it over, e.g.
+# after the worker holding it crashed
+DEDUP_CLAIM_LEASE = int(os.environ.get('DEDUP_CLAIM_LEASE', '30'))
+
+
+class DuplicateInFlight(Exception):
+    """Raised when the original submission for a duplicate has not finished yet"""
+
+
+class IdempotencyKeyReused(Exception):
+    """Raised when an Idempotency-Key is sent again with a different payload"""
+
+
+def content_hash(payload: dict) -> str:
+    """Hash a submission after normalizing whitespace and email case"""
+    normalized = {key: " ".join(str(value).split()) for key, value in sorted(payload.items())}
+    if "email" in normalized:
+        normalized["email"] = normalized["email"].lower()
+    return hashlib.sha256(json.dumps(normalized).encode()).hexdigest()
+
+
+class Deduplicator:
+    """Returns the original response for repeated submissions without writing again.
+
+    A submission is identified by its Idempotency-Key header (if sent) and by
+    a hash of its content. Recent responses live in a bounded in-memory LRU;
+    the dedup collection, with a unique (tenant_id, key) index and a TTL on
+    expires_at, catches duplicates across workers and restarts.
+
+    A claim is pending until complete() stores the response. Pending claims
+    hold a short lease (claimed_until), after which a retry takes them over.
+    Each claim records the content hash, so reusing an Idempotency-Key for a
+    different payload is rejected instead of replaying the first response,
+    and the id the submission will be stored under, so a retry taking over
+    an abandoned claim can replay a submission that was stored but never
+    completed instead of writing it again.
+    """
+
+    def __init__(self, max_entries: int, key_ttl: int, content_window: int, lease: int = DEDUP_CLAIM_LEASE):
+        self.max_entries = max_entries
+        self.key_ttl = key_ttl
+        self.content_window = content_window
+        self.lease = lease
+        self._recent: "OrderedDict[Tuple[str, str], Tuple[dict, str, float]]" = OrderedDict()
+
+    def keys(self, payload: dict, idempotency_key: Optional[str]) -> List[Tuple[str, int]]:
+        """Dedup keys for a submission with how long each stays valid; the content key is last"""
+        keys = []
+        if idempotency_key:
+            keys.append((f"key:{idempotency_key}", self.key_ttl))
+        keys.append((f"hash:{content_hash(payload)}", self.content_window))
+        return keys
+
+    def _remember(self, tenant_id: str, key: str, content_key: str, response: dict, ttl: int):
+        self._recent[(tenant_id, key)] = (response, content_key, time.monotonic() + ttl)
+        self._recent.move_to_end((tenant_id, key))
+        while len(self._recent) > self.max_entries:
+            self._recent.popitem(last=False)
+
+    def _recall(self, tenant_id: str, key: str, content_key: str) -> Optional[dict]:
+        entry = self._recent.get((tenant_id, key))
+        if entry is None:
+            return None
+        if entry[2] < time.monotonic():
+            del self._recent[(tenant_id, key)]
+            return None
+        if entry[1] != content_key:
+            raise IdempotencyKeyReused(key)
+        self._recent.move_to_end((tenant_id, key))
+        return entry[0]
+
+    async def claim(self, db, tenant_id: str, keys: List[Tuple[str, int]], submission_id: str,
+                    replay: Callable[[str], Awaitable[Optional[dict]]]) -> Optional[dict]:
+        """Reserve the keys for a new submission, or return the original response.
+
+        replay(submission_id) returns the response for a submission that was
+        already stored, or None. Raises DuplicateInFlight if the original has
+        not completed yet, and IdempotencyKeyReused if the key was first used
+        for other content.
+        """
+        content_key = keys[-1][0]
+        for key, _ in keys:
+            response = self._recall(tenant_id, key, content_key)
+            if response is not None:
+                return response
+
+        now = datetime.utcnow()
+        claimed = []
+        for key, ttl in keys:
+            claim = {
+                "tenant_id": tenant_id, "key": key, "content_key": content_key,
+                "submission_id": submission_id, "response": None,
+                "claimed_until": now + timedelta(seconds=self.lease),
+                "expires_at": now + timedelta(seconds=ttl),
+            }
+            try:
+                # A copy, since insert_one adds an _id that a take-over must not reuse
+                await db[CONTACT_DEDUP_COLLECTION].insert_one(dict(claim))
+                claimed.append((key, ttl))
+                continue
+            except DuplicateKeyError:
+                existing = await db[CONTACT_DEDUP_COLLECTION].find_one({"tenant_id": tenant_id, "key": key})
+
+            if existing is None or existing["expires_at"] < now:
+                # Expired but not yet removed by the TTL monitor
+                taken = await self._take_over(db, tenant_id, key, existing, claim)
+            elif existing.get("content_key", content_key) != content_key:
+                await self.release(db, tenant_id, claimed)
+                raise IdempotencyKeyReused(key)
+            elif existing["response"] is not None:
+                # Link any keys claimed so far to the original response
+                await self.complete(db, tenant_id, claimed, existing["response"], content_key)
+                self._remember(tenant_id, key, content_key, existing["response"], ttl)
+                return existing["response"]
+            elif existing["claimed_until"] < now:
+                # The worker holding the claim never completed it, possibly
+                # after storing the submission
+                response = None
+                if existing.get("submission_id"):
+                    response = await replay(existing["submission_id"])
+                if response is not None:
+                    await self.complete(db, tenant_id, claimed + [(key, ttl)], response, content_key)
+                    return response
+                taken = await self._take_over(db, tenant_id, key, existing, claim)
+            else:
+                taken = False
+
+            if not taken:
+                await self.release(db, tenant_id, claimed)
+                raise DuplicateInFlight(key)
+            claimed.append((key, ttl))
+        return None
+
+    async def _take_over(self, db, tenant_id: str, key: str, existing: Optional[dict], claim: dict) -> bool:
+        """Replace an expired or abandoned claim, unless another request replaced it first"""
+        query = {"tenant_id": tenant_id, "key": key}
+        if existing is not None:
+            query["_id"] = existing["_id"]
+            query["claimed_until"] = existing["claimed_until"]
+        result = await db[CONTACT_DEDUP_COLLECTION].replace_one(query, claim, upsert=existing is None)
+        return result.modified_count == 1 or result.upserted_id is not None
+
+    async def complete(self, db, tenant_id: str, keys: List[Tuple[str, int]], response: dict,
+                       content_key: Optional[str] = None):
+        """Store the response for claimed keys so duplicates can replay it"""
+        if not keys:
+            return
+        content_key = content_key or keys[-1][0]
+        for key, ttl in keys:
+            await db[CONTACT_DEDUP_COLLECTION].update_one(
+                {"tenant_id": tenant_id, "key": key}, {"$set": {"response": response}}
+            )
+            self._remember(tenant_id, key, content_key, response, ttl)
+
+    async def release(self, db, tenant_id: str, keys: List[Tuple[str, int]]):
+        """Drop claims for a submission that failed, so a retry can go through"""
+        if keys:
+            await db[CONTACT_DEDUP_COLLECTION].delete_many(
+                {"tenant_id": tenant_id, "key": {"$in": [key for key, _ in keys]}, "response": None}
+            )
+
+
+async def ensure_dedup_indexes(db):
+    await db[CONTACT_DEDUP_COLLECTION].create_index([("tenant_id", 1), ("key", 1)], unique=True)
+    await db[CONTACT_DEDUP_COLLECTION].create_index("expires_at", expireAfterSeconds=0)
+
+
+contact_dedup = Deduplicator(DEDUP_CACHE_SIZE, IDEMPOTENCY_KEY_TTL, CONTENT_DEDUP_WINDOW)
@@ -0,0 +1,218 @@
+import contextvars
+import copy
+import json
+import logging
+import os
+import queue
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+from pymongo import monitoring
+
+# Logging configuration
+LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO')
+LOG_QUEUE_SIZE = int(os.environ.get('LOG_QUEUE_SIZE', '10000'))
+# Successful requests are all logged up to this rate, then sampled
+ACCESS_LOG_FULL_RPS = float(os.environ.get('ACCESS_LOG_FULL_RPS', '50'))
+ACCESS_LOG_SAMPLE_RATE = float(os.environ.get('ACCESS_LOG_SAMPLE_RATE', '0.1'))
+ACCESS_LOG_SLOW_MS = float(os.environ.get('ACCESS_LOG_SLOW_MS', '500'))
+REQUEST_ID_HEADER = "X-Request-ID"
+
+# Attributes present on every LogRecord, excluded from the JSON "extra" fields
+_RESERVED_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+access_logger = logging.getLogger("access")
+
+
+class RequestContext:
+    """Per-request state shared with log records and the DB timing listener"""
+
+    __slots__ = ("request_id", "db_time_ms", "db_calls")
+
+    def __init__(self, request_id: str):
+        self.request_id = request_id
+        self.db_time_ms = 0.0
+        self.db_calls = 0
+
+
+request_context: contextvars.ContextVar[Optional[RequestContext]] = contextvars.ContextVar(
+    "request_context", default=None
+)
+
+
+class RequestIdFilter(logging.Filter):
+    """Stamps records with the correlation id of the request being handled"""
+
+    def filter(self, record):
+        ctx = request_context.get()
+        record.request_id = ctx.request_id if ctx else None
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats records as one JSON object per line"""
+
+    def format(self, record):
+        payload = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED_ATTRS and value is not None:
+                payload[key] = value
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(payload, default=str)
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """QueueHandler that drops records instead of blocking when the queue is full"""
+
+    def prepare(self, record):
+        # The stdlib version formats the record (tracebacks included) on the
+        # calling thread and drops exc_info. Only merge the message args here,
+        # so formatting happens on the listener thread with exc_info intact.
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            pass
+
+
+class DbTimeListener(monitoring.CommandListener):
+    """Accumulates Mongo command time on the current request context.
+
+    motor copies the caller's context into its executor threads, so the
+    RequestContext seen here is the one set by the access log middleware.
+    """
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        self._record(event)
+
+    def failed(self, event):
+        self._record(event)
+
+    @staticmethod
+    def _record(event):
+        ctx = request_context.get()
+        if ctx is not None:
+            ctx.db_time_ms += event.duration_micros / 1000
+            ctx.db_calls += 1
+
+
+class AccessLogSampler:
+    """Logs every successful request below a rate limit and samples above it"""
+
+    def __init__(self, full_rps: float, sample_rate: float):
+        self.full_rps = full_rps
+        self.sample_rate = sample_rate
+        self._window = 0
+        self._count = 0
+        self._sampled = 0.0
+
+    def should_log(self) -> bool:
+        window = int(time.monotonic())
+        if window != self._window:
+            self._window = window
+            self._count = 0
+        self._count += 1
+        if self._count <= self.full_rps:
+            return True
+        # Deterministic sampling so a burst logs an even spread of requests
+        self._sampled += self.sample_rate
+        if self._sampled >= 1:
+            self._sampled -= 1
+            return True
+        return False
+
+
+_listener: Optional[QueueListener] = None
+access_log_sampler = AccessLogSampler(ACCESS_LOG_FULL_RPS, ACCESS_LOG_SAMPLE_RATE)
+db_time_listener = DbTimeListener()
+
+
+def setup_logging(stream=sys.stderr):
+    """Route all logging through a queue drained by a background thread"""
+    global _listener
+    if _listener is not None:
+        return
+
+    log_queue = queue.Queue(LOG_QUEUE_SIZE)
+    queue_handler = NonBlockingQueueHandler(log_queue)
+    queue_handler.addFilter(RequestIdFilter())
+
+    stream_handler = logging.StreamHandler(stream)
+    stream_handler.setFormatter(JsonFormatter())
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(LOG_LEVEL)
+
+    # uvicorn's own handlers write synchronously to the stream: route its
+    # server logs through the queue and drop its access log, which
+    # access_log_middleware replaces
+    for name in ("uvicorn", "uvicorn.error"):
+        uvicorn_logger = logging.getLogger(name)
+        uvicorn_logger.handlers.clear()
+        uvicorn_logger.propagate = True
+    uvicorn_access = logging.getLogger("uvicorn.access")
+    uvicorn_access.handlers.clear()
+    uvicorn_access.disabled = True
+
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+
+
+def shutdown_logging():
+    """Flush queued records and stop the background thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+async def access_log_middleware(request, call_next):
+    """Assigns a correlation id and emits a structured access log per request"""
+    request_id = request.headers.get(REQUEST_ID_HEADER) or uuid.uuid4().hex
+    ctx = RequestContext(request_id)
+    token = request_context.set(ctx)
+    start = time.perf_counter()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+        response.headers[REQUEST_ID_HEADER] = request_id
+        return response
+    finally:
+        latency_ms = (time.perf_counter() - start) * 1000
+        if status_code >= 400 or latency_ms >= ACCESS_LOG_SLOW_MS or access_log_sampler.should_log():
+            route = request.scope.get("route")
+            access_logger.info(
+                "%s %s %s", request.method, request.url.path, status_code,
+                extra={
+                    "method": request.method,
+                    "path": request.url.path,
+                    "route": getattr(route, "path", None),
+                    "status": status_code,
+                    "latency_ms": round(latency_ms, 3),
+                    "db_time_ms": round(ctx.db_time_ms, 3),
+                    "db_calls": ctx.db_calls,
+                },
+            )
+        request_context.reset(token)
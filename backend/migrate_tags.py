@@ -0,0 +1,37 @@
+"""
+Tag dictionary migration
+
+Converts the free-text technologies, features and skills lists of existing
+documents into tag ids, creating tags as needed. Documents that are already
+migrated are skipped, so the script can be re-run safely.
+
+Usage: python migrate_tags.py
+"""
+
+import asyncio
+
+from database import db, TAGS_COLLECTION
+from tags import TAGGED_FIELDS, tag_dictionary, ensure_tag_indexes
+
+
+async def migrate_tags():
+    """Replace tagged name lists with id lists in all tagged collections"""
+    await ensure_tag_indexes(db)
+
+    for collection, fields in TAGGED_FIELDS.items():
+        pending = {"$or": [{name_field: {"$exists": True}} for name_field in fields]}
+        migrated = 0
+        async for doc in db[collection].find(pending):
+            encoded = await tag_dictionary.encode(db, collection, {name: doc[name] for name in fields if name in doc})
+            await db[collection].update_one(
+                {"_id": doc["_id"]},
+                {"$set": encoded, "$unset": {name: "" for name in fields}}
+            )
+            migrated += 1
+        print(f"✅ {collection}: migrated {migrated} documents")
+
+    print(f"✅ Tag dictionary holds {await db[TAGS_COLLECTION].count_documents({})} tags")
+
+
+if __name__ == "__main__":
+    asyncio.run(migrate_tags())
@@ -0,0 +1,47 @@
+"""
+Tenancy migration
+
+Assigns existing single-portfolio documents to the default tenant, creates
+the tenant-leading compound indexes and drops the single-field indexes they
+replace. Documents that already have a tenant are left alone, so the script
+can be re-run safely.
+
+Usage: python migrate_tenants.py [tenant_id]
+"""
+
+import asyncio
+import sys
+
+from pymongo.errors import OperationFailure
+
+from database import db, TOMBSTONES_COLLECTION
+from changes import SYNCED_COLLECTIONS, ensure_change_indexes
+from tags import TAGGED_FIELDS, ensure_tag_indexes
+from tenancy import DEFAULT_TENANT, TENANT_COLLECTIONS, ensure_tenant_indexes
+
+
+async def migrate_tenants(tenant_id: str = DEFAULT_TENANT):
+    """Move documents without a tenant into ``tenant_id``"""
+    for collection in TENANT_COLLECTIONS + (TOMBSTONES_COLLECTION,):
+        result = await db[collection].update_many(
+            {"tenant_id": {"$exists": False}}, {"$set": {"tenant_id": tenant_id}}
+        )
+        print(f"✅ {collection}: assigned {result.modified_count} documents to {tenant_id}")
+
+    await ensure_tag_indexes(db)
+    await ensure_change_indexes(db)
+    await ensure_tenant_indexes(db)
+
+    # Single-field indexes superseded by the tenant-leading ones
+    obsolete = [(collection, f"{field}_1") for collection, fields in TAGGED_FIELDS.items() for field in fields.values()]
+    obsolete += [(collection, "updated_at_1") for collection in SYNCED_COLLECTIONS.values()]
+    for collection, index_name in obsolete:
+        try:
+            await db[collection].drop_index(index_name)
+            print(f"✅ {collection}: dropped index {index_name}")
+        except OperationFailure:
+            pass
+
+
+if __name__ == "__main__":
+    asyncio.run(migrate_tenants(*sys.argv[1:2]))
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, EmailStr
-from typing import List, Optional
+from typing import Dict, Generic, List, Optional, TypeVar
 from datetime import datetime
 import uuid
 
@@ -112,15 +112,115 @@ class ContactCreate(BaseModel):
     subject: str
     message: str
 
+# Batch Request Models
+class BatchRequest(BaseModel):
+    ids: List[str]
+
+# Output Models
+class SkillCategoryOut(BaseModel):
+    id: str
+    category: str
+    skills: List[str]
+    created_at: datetime
+    updated_at: datetime
+
+class ProjectOut(BaseModel):
+    id: str
+    title: str
+    category: str
+    description: str
+    technologies: List[str]
+    features: List[str]
+    status: str
+    impact: str
+    display_order: int = 0
+    created_at: datetime
+    updated_at: datetime
+
+class ExperienceOut(BaseModel):
+    id: str
+    company: str
+    position: str
+    duration: str
+    location: str
+    achievements: List[str]
+    display_order: int = 0
+    created_at: datetime
+    updated_at: datetime
+
+class EducationOut(BaseModel):
+    id: str
+    institution: str
+    degree: str
+    duration: str
+    location: str
+    status: str
+    display_order: int = 0
+    created_at: datetime
+    updated_at: datetime
+
+class CertificationOut(BaseModel):
+    id: str
+    name: str
+    issuer: Optional[str] = None
+    date_obtained: Optional[datetime] = None
+    display_order: int = 0
+    created_at: datetime
+    updated_at: datetime
+
+class ContactOut(BaseModel):
+    id: str
+    name: str
+    email: str
+    subject: str
+    message: str
+    is_read: bool = False
+    created_at: datetime
+    updated_at: datetime
+
+# Stats Models
+class CountOut(BaseModel):
+    name: str
+    count: int
+
+class StatsOut(BaseModel):
+    technologies: List[CountOut]
+    skills_per_category: Dict[str, int]
+    projects_by_status: Dict[str, int]
+    contacts_per_day: Dict[str, int]
+    contacts_per_week: Dict[str, int]
+    computed_at: datetime
+
 # API Response Models
-class ApiResponse(BaseModel):
+T = TypeVar("T")
+
+# Change Feed Models
+class ChangeSet(BaseModel, Generic[T]):
+    upserted: List[T] = []
+    deleted: List[str] = []
+
+class ChangesOut(BaseModel):
+    version: int
+    full_reload: bool = False
+    skills: ChangeSet[SkillCategoryOut]
+    projects: ChangeSet[ProjectOut]
+    experience: ChangeSet[ExperienceOut]
+    education: ChangeSet[EducationOut]
+    certifications: ChangeSet[CertificationOut]
+
+class ApiResponse(BaseModel, Generic[T]):
     success: bool
-    data: Optional[dict] = None
+    data: Optional[T] = None
     error: Optional[str] = None
     code: Optional[str] = None
 
-class ApiListResponse(BaseModel):
+class ApiListResponse(BaseModel, Generic[T]):
     success: bool
-    data: Optional[List[dict]] = None
+    data: Optional[List[T]] = None
     error: Optional[str] = None
-    code: Optional[str] = None
\ No newline at end of file
+    code: Optional[str] = None
+
+class ApiBatchResponse(ApiListResponse[T], Generic[T]):
+    missing: List[str] = []
+    # Ids that could not be looked up while serving stale data; they may exist
+    unavailable: List[str] = []
\ No newline at end of file
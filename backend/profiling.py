@@ -0,0 +1,229 @@
+import asyncio
+import cProfile
+import hmac
+import io
+import logging
+import marshal
+import os
+import pstats
+import random
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Optional
+
+from bson import json_util
+from pymongo import monitoring
+from pymongo.errors import CollectionInvalid
+
+# Profiling configuration
+PROFILE_SAMPLE_RATE = float(os.environ.get('PROFILE_SAMPLE_RATE', '0'))
+PROFILE_TOKEN = os.environ.get('PROFILE_TOKEN')
+PROFILE_HEADER = "X-Profile-Token"
+PROFILE_MAX_STORED = int(os.environ.get('PROFILE_MAX_STORED', '50'))
+PROFILE_STORE_BYTES = int(os.environ.get('PROFILE_STORE_BYTES', str(64 * 1024 * 1024)))
+
+# Slow query log configuration
+SLOW_QUERY_MS = float(os.environ.get('SLOW_QUERY_MS', '100'))
+SLOW_QUERY_MAX_STORED = int(os.environ.get('SLOW_QUERY_MAX_STORED', '200'))
+SLOW_QUERY_STORE_BYTES = int(os.environ.get('SLOW_QUERY_STORE_BYTES', str(8 * 1024 * 1024)))
+
+# Capped collections shared by all workers. Named here rather than in
+# database.py, which imports this module for its command listener.
+PROFILES_COLLECTION = "profiles"
+SLOW_QUERIES_COLLECTION = "slow_queries"
+
+# Commands that can be passed to explain()
+EXPLAINABLE_COMMANDS = {"find", "aggregate", "count", "distinct"}
+
+logger = logging.getLogger(__name__)
+
+
+def is_privileged(headers) -> bool:
+    """Check whether the request carries the configured profiling token"""
+    token = headers.get(PROFILE_HEADER)
+    return bool(PROFILE_TOKEN) and token is not None and hmac.compare_digest(token.encode(), PROFILE_TOKEN.encode())
+
+
+class RequestProfiler:
+    """Captures cProfile call-stack profiles for sampled or privileged requests.
+
+    cProfile hooks the event loop thread, so a profile also contains any
+    other requests interleaved with the profiled one. Only one profile is
+    captured at a time to keep that noise and the overhead bounded.
+
+    Profiles are stored in a capped collection, so any worker can serve a
+    download and they survive restarts.
+    """
+
+    def __init__(self, sample_rate: float):
+        self.sample_rate = sample_rate
+        self._lock = threading.Lock()
+
+    def should_profile(self, headers) -> bool:
+        if is_privileged(headers):
+            return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    async def profile(self, db, request, call_next):
+        if not self._lock.acquire(blocking=False):
+            return await call_next(request)
+
+        profiler = cProfile.Profile()
+        started_at = datetime.utcnow()
+        start = time.perf_counter()
+        try:
+            profiler.enable()
+            response = await call_next(request)
+        finally:
+            profiler.disable()
+            self._lock.release()
+
+        duration_ms = (time.perf_counter() - start) * 1000
+        profiler.create_stats()
+        profile_id = str(uuid.uuid4())
+        try:
+            await db[PROFILES_COLLECTION].insert_one({
+                "id": profile_id,
+                "method": request.method,
+                "path": request.url.path,
+                "status_code": response.status_code,
+                "duration_ms": round(duration_ms, 3),
+                "created_at": started_at,
+                "stats": marshal.dumps(profiler.stats),
+            })
+        except Exception as e:
+            logger.error("Error storing profile: %s", e)
+            return response
+        response.headers["X-Profile-Id"] = profile_id
+        return response
+
+    async def list(self, db):
+        return await db[PROFILES_COLLECTION].find(
+            {}, {"_id": 0, "stats": 0}
+        ).sort("created_at", -1).to_list(None)
+
+    async def get(self, db, profile_id: str) -> Optional[dict]:
+        return await db[PROFILES_COLLECTION].find_one({"id": profile_id}, {"_id": 0})
+
+    @staticmethod
+    def to_text(stats_bytes: bytes, limit: int = 50) -> str:
+        """Render a stored profile as a pstats report sorted by cumulative time"""
+        stream = io.StringIO()
+        stats = pstats.Stats(stream=stream)
+        stats.stats = marshal.loads(stats_bytes)
+        stats.get_top_level_stats()
+        stats.sort_stats("cumulative").print_stats(limit)
+        return stream.getvalue()
+
+
+def summarize_plan(explain_result: dict) -> dict:
+    """Reduce an explain() result to the stage chain and index used"""
+    planner = explain_result.get("queryPlanner", {})
+    plan = planner.get("winningPlan", {})
+    # Aggregations wrap the find plan in a $cursor stage
+    if "queryPlan" in plan:
+        plan = plan["queryPlan"]
+    stages = []
+    index_name = None
+    while plan:
+        stages.append(plan.get("stage"))
+        index_name = index_name or plan.get("indexName")
+        plan = plan.get("inputStage")
+    return {"stages": stages, "index": index_name}
+
+
+class SlowQueryLog(monitoring.CommandListener):
+    """Records Mongo commands slower than a threshold along with their query plan.
+
+    pymongo calls the listener from motor's executor threads, so explain()
+    and storing the entry are scheduled back onto the event loop rather than
+    run inline. Entries go to a capped collection in the queried database;
+    filters and pipelines are stored as extended JSON because they contain
+    $-prefixed keys.
+    """
+
+    def __init__(self, threshold_ms: float):
+        self.threshold_ms = threshold_ms
+        self._pending = {}
+        self._client = None
+        self._loop = None
+
+    def attach(self, client, loop: asyncio.AbstractEventLoop):
+        """Bind the client and event loop used to run explain()"""
+        self._client = client
+        self._loop = loop
+
+    def started(self, event):
+        if event.command_name in EXPLAINABLE_COMMANDS:
+            self._pending[event.request_id] = dict(event.command)
+
+    def succeeded(self, event):
+        command = self._pending.pop(event.request_id, None)
+        if command is None:
+            return
+        duration_ms = event.duration_micros / 1000
+        if duration_ms < self.threshold_ms:
+            return
+
+        entry = {
+            "command": event.command_name,
+            "database": event.database_name,
+            "collection": command.get(event.command_name),
+            "filter": command.get("filter", command.get("query")),
+            "sort": command.get("sort"),
+            "pipeline": command.get("pipeline"),
+            "duration_ms": round(duration_ms, 3),
+            "created_at": datetime.utcnow(),
+            "explain": None,
+        }
+        logger.warning(
+            "Slow query on %s.%s took %.1fms", entry["database"], entry["collection"], duration_ms
+        )
+
+        if self._client is not None and self._loop is not None and not self._loop.is_closed():
+            asyncio.run_coroutine_threadsafe(self._record(entry, command), self._loop)
+
+    def failed(self, event):
+        self._pending.pop(event.request_id, None)
+
+    async def _record(self, entry: dict, command: dict):
+        database = self._client[entry["database"]]
+        explained = {k: v for k, v in command.items() if k not in ("lsid", "$db", "$clusterTime", "$readPreference")}
+        try:
+            result = await database.command("explain", explained, verbosity="queryPlanner")
+            entry["explain"] = summarize_plan(result)
+        except Exception as e:
+            entry["explain"] = {"error": str(e)}
+
+        for key in ("filter", "sort", "pipeline"):
+            entry[key] = json_util.dumps(entry[key])
+        try:
+            await database[SLOW_QUERIES_COLLECTION].insert_one(entry)
+        except Exception as e:
+            logger.error("Error storing slow query: %s", e)
+
+    async def list(self, db):
+        entries = await db[SLOW_QUERIES_COLLECTION].find({}, {"_id": 0}).sort("created_at", -1).to_list(None)
+        for entry in entries:
+            for key in ("filter", "sort", "pipeline"):
+                entry[key] = json_util.loads(entry[key])
+        return entries
+
+
+async def ensure_profiling_collections(db):
+    """Create the capped profile and slow query collections"""
+    for name, size, max_docs in (
+        (PROFILES_COLLECTION, PROFILE_STORE_BYTES, PROFILE_MAX_STORED),
+        (SLOW_QUERIES_COLLECTION, SLOW_QUERY_STORE_BYTES, SLOW_QUERY_MAX_STORED),
+    ):
+        try:
+            await db.create_collection(name, capped=True, size=size, max=max_docs)
+        except CollectionInvalid:
+            pass  # Already exists
+    await db[PROFILES_COLLECTION].create_index("id")
+
+
+request_profiler = RequestProfiler(PROFILE_SAMPLE_RATE)
+slow_query_log = SlowQueryLog(SLOW_QUERY_MS)
@@ -0,0 +1,208 @@
+import asyncio
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from pymongo.errors import PyMongoError
+
+from tenancy import current_tenant
+
+# Resilience configuration
+DB_OP_TIMEOUT_MS = float(os.environ.get('DB_OP_TIMEOUT_MS', '2000'))
+BREAKER_FAILURE_THRESHOLD = int(os.environ.get('BREAKER_FAILURE_THRESHOLD', '5'))
+BREAKER_RESET_TIMEOUT = float(os.environ.get('BREAKER_RESET_TIMEOUT', '10'))
+STALE_CACHE_MAX_ENTRIES = int(os.environ.get('STALE_CACHE_MAX_ENTRIES', '10000'))
+STALE_CACHE_MAX_PER_TENANT = int(os.environ.get('STALE_CACHE_MAX_PER_TENANT', '100'))
+
+# Errors that count as the database being unhealthy
+DB_ERRORS = (asyncio.TimeoutError, PyMongoError)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because the circuit is open"""
+
+
+class CircuitBreaker:
+    """Fails fast after repeated errors and lets a single probe through to test recovery"""
+
+    def __init__(self, name: str, failure_threshold: int, reset_timeout: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.times_opened = 0
+        self._probe_in_flight = False
+
+    def allow(self) -> bool:
+        if self.state == CLOSED:
+            return True
+        if self.state == OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+            self._transition(HALF_OPEN)
+        if self.state == HALF_OPEN and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return True
+        return False
+
+    def record_success(self):
+        self._probe_in_flight = False
+        self.failures = 0
+        if self.state != CLOSED:
+            self._transition(CLOSED)
+
+    def release_probe(self):
+        """Free the probe slot after a call that says nothing about DB health"""
+        self._probe_in_flight = False
+
+    def record_failure(self):
+        self._probe_in_flight = False
+        self.failures += 1
+        if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+            if self.state != OPEN:
+                self.times_opened += 1
+                self._transition(OPEN)
+
+    def _transition(self, state: str):
+        logger.warning("Circuit %s: %s -> %s", self.name, self.state, state)
+        self.state = state
+
+    def metrics(self) -> dict:
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "times_opened": self.times_opened,
+        }
+
+
+class StaleWhileErrorReader:
+    """Runs reads with a timeout behind a circuit breaker, remembering the last good result.
+
+    When the read fails or the circuit is open, the last-known-good value for
+    the same key is returned along with its age in seconds. Values are
+    partitioned by tenant: each tenant is capped at its own quota, and when
+    the global cap is reached the largest partition gives up an entry, so a
+    busy tenant cannot evict everyone else's fallback data. Filtered and
+    per-item reads, whose keys come from request input, pass a partition
+    name so they are capped separately from the tenant's main entries. Empty results are not
+    remembered.
+    """
+
+    def __init__(self, breaker: CircuitBreaker, timeout_ms: float, max_entries: int, max_per_tenant: int):
+        self.breaker = breaker
+        self.timeout = timeout_ms / 1000
+        self.max_entries = max_entries
+        self.max_per_tenant = max_per_tenant
+        self._last_good: Dict[str, "OrderedDict[str, Tuple[Any, float]]"] = {}
+        self._size = 0
+
+    async def read(self, key: str, fetch: Callable[[], Awaitable[Any]],
+                   partition: Optional[str] = None) -> Tuple[Any, Optional[float]]:
+        """Return (value, None) when fresh or (value, age_seconds) when stale"""
+        tenant = self._partition(partition)
+        if self.breaker.allow():
+            try:
+                value = await asyncio.wait_for(fetch(), self.timeout)
+            except DB_ERRORS as e:
+                self.breaker.record_failure()
+                logger.error("Read %s failed: %r", key, e)
+                error = e
+            except BaseException:
+                self.breaker.release_probe()
+                raise
+            else:
+                self.breaker.record_success()
+                self._remember(tenant, key, value)
+                return value, None
+        else:
+            error = CircuitOpenError(f"Circuit {self.breaker.name} is open")
+
+        entries = self._last_good.get(tenant)
+        if entries and key in entries:
+            value, stored_at = entries[key]
+            return value, time.monotonic() - stored_at
+        raise error
+
+    async def read_many(self, keys: List[str], fetch: Callable[[], Awaitable[Dict[str, Any]]],
+                        partition: Optional[str] = None) -> Tuple[Dict[str, Any], Optional[float]]:
+        """Batch variant of read: ``fetch`` returns values by key.
+
+        On success each value is remembered under its own key, so single-key
+        reads in the same partition can fall back to it too. On failure, keys
+        with a last-known-good value are filled from it and the oldest age is
+        returned.
+        """
+        tenant = self._partition(partition)
+        if self.breaker.allow():
+            try:
+                values = await asyncio.wait_for(fetch(), self.timeout)
+            except DB_ERRORS as e:
+                self.breaker.record_failure()
+                logger.error("Batch read of %d keys failed: %r", len(keys), e)
+                error = e
+            except BaseException:
+                self.breaker.release_probe()
+                raise
+            else:
+                self.breaker.record_success()
+                for key, value in values.items():
+                    self._remember(tenant, key, value)
+                return values, None
+        else:
+            error = CircuitOpenError(f"Circuit {self.breaker.name} is open")
+
+        entries = self._last_good.get(tenant) or {}
+        cached = {key: entries[key] for key in keys if key in entries}
+        if not cached:
+            raise error
+        now = time.monotonic()
+        return {key: value for key, (value, _) in cached.items()}, max(now - stored_at for _, stored_at in cached.values())
+
+    def _partition(self, partition: Optional[str]) -> str:
+        return current_tenant() if partition is None else f"{current_tenant()}:{partition}"
+
+    def _remember(self, tenant: str, key: str, value: Any):
+        if value is None or value == [] or value == {}:
+            return
+        entries = self._last_good.setdefault(tenant, OrderedDict())
+        if entries.pop(key, None) is not None:
+            self._size -= 1
+        if len(entries) >= self.max_per_tenant:
+            entries.popitem(last=False)
+            self._size -= 1
+        elif self._size >= self.max_entries:
+            self._evict_from_largest()
+            self._last_good[tenant] = entries
+        entries[key] = (value, time.monotonic())
+        self._size += 1
+
+    def _evict_from_largest(self):
+        """Drop the oldest entry of the tenant holding the most entries"""
+        tenant, entries = max(self._last_good.items(), key=lambda item: len(item[1]))
+        entries.popitem(last=False)
+        self._size -= 1
+        if not entries:
+            del self._last_good[tenant]
+
+
+def mark_stale(response, age: Optional[float]):
+    """Add staleness headers to a response served from last-known-good data"""
+    if age is not None:
+        response.headers["X-Served-Stale"] = "true"
+        response.headers["Age"] = str(int(age))
+    return response
+
+
+mongo_breaker = CircuitBreaker("mongo", BREAKER_FAILURE_THRESHOLD, BREAKER_RESET_TIMEOUT)
+db_reads = StaleWhileErrorReader(
+    mongo_breaker, DB_OP_TIMEOUT_MS, STALE_CACHE_MAX_ENTRIES, STALE_CACHE_MAX_PER_TENANT
+)
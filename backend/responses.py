@@ -0,0 +1,70 @@
+from functools import lru_cache
+from typing import List, Type
+
+from fastapi.responses import Response
+from pydantic import BaseModel, TypeAdapter
+from pydantic_core import to_json
+
+from models import ApiResponse, ApiListResponse, ApiBatchResponse
+
+
+class ModelResponse(Response):
+    """JSON response whose body is already serialized by pydantic-core"""
+    media_type = "application/json"
+
+
+@lru_cache(maxsize=None)
+def _list_adapter(model: Type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(List[model])
+
+
+def validated(model: Type[BaseModel], docs: List[dict]) -> List[dict]:
+    """Validate raw documents against ``model`` and dump them as JSON-ready dicts.
+
+    Only the model's fields are kept, so the result can be cached and later
+    served with trusted=True.
+    """
+    adapter = _list_adapter(model)
+    return adapter.dump_python(adapter.validate_python(docs), mode="json")
+
+
+def validated_item(model: Type[BaseModel], doc: dict) -> dict:
+    """Single-document variant of validated"""
+    return model.model_validate(doc).model_dump(mode="json")
+
+
+def list_response(model: Type[BaseModel], docs: List[dict], trusted: bool = False) -> ModelResponse:
+    """Build an ApiListResponse body from raw documents in a single pass.
+
+    Untrusted documents are validated against ``model``; trusted ones (for
+    example data that was validated before it was cached) skip validation
+    and are encoded directly by pydantic-core.
+    """
+    if trusted:
+        return ModelResponse(content=to_json({"success": True, "data": docs, "error": None, "code": None}))
+    items = _list_adapter(model).validate_python(docs)
+    body = ApiListResponse[model].model_construct(success=True, data=items, error=None, code=None)
+    return ModelResponse(content=body.model_dump_json())
+
+
+def item_response(model: Type[BaseModel], doc: dict, trusted: bool = False) -> ModelResponse:
+    """Build an ApiResponse body for a single document"""
+    if trusted:
+        return ModelResponse(content=to_json({"success": True, "data": doc, "error": None, "code": None}))
+    body = ApiResponse[model].model_construct(success=True, data=model.model_validate(doc), error=None, code=None)
+    return ModelResponse(content=body.model_dump_json())
+
+
+def batch_response(model: Type[BaseModel], docs: List[dict], missing: List[str],
+                   unavailable: List[str] = (), trusted: bool = False) -> ModelResponse:
+    """Build an ApiBatchResponse body listing found documents, missing and unavailable ids"""
+    unavailable = list(unavailable)
+    if trusted:
+        return ModelResponse(content=to_json(
+            {"success": True, "data": docs, "error": None, "code": None, "missing": missing, "unavailable": unavailable}
+        ))
+    items = _list_adapter(model).validate_python(docs)
+    body = ApiBatchResponse[model].model_construct(
+        success=True, data=items, error=None, code=None, missing=missing, unavailable=unavailable
+    )
+    return ModelResponse(content=body.model_dump_json())
@@ -1,16 +1,26 @@
 import asyncio
 from database import db, SKILLS_COLLECTION, PROJECTS_COLLECTION, EXPERIENCE_COLLECTION, EDUCATION_COLLECTION, CERTIFICATIONS_COLLECTION
 from models import SkillCategory, Project, Experience, Education, Certification
+from tags import tag_dictionary, ensure_tag_indexes
+from changes import record_deletions, ensure_change_indexes
+from tenancy import DEFAULT_TENANT, ensure_tenant_indexes
+from stats import refresh_stats
 
-async def seed_database():
-    """Seed the database with initial portfolio data"""
+async def seed_database(tenant_id: str = DEFAULT_TENANT):
+    """Seed the database with initial portfolio data for a tenant"""
+    tenant = {"tenant_id": tenant_id}
     
-    # Clear existing data
-    await db[SKILLS_COLLECTION].delete_many({})
-    await db[PROJECTS_COLLECTION].delete_many({})
-    await db[EXPERIENCE_COLLECTION].delete_many({})
-    await db[EDUCATION_COLLECTION].delete_many({})
-    await db[CERTIFICATIONS_COLLECTION].delete_many({})
+    # Clear existing data, leaving tombstones for syncing clients
+    for collection in (SKILLS_COLLECTION, PROJECTS_COLLECTION, EXPERIENCE_COLLECTION, EDUCATION_COLLECTION, CERTIFICATIONS_COLLECTION):
+        await record_deletions(db, collection, tenant_id, {})
+    await db[SKILLS_COLLECTION].delete_many(tenant)
+    await db[PROJECTS_COLLECTION].delete_many(tenant)
+    await db[EXPERIENCE_COLLECTION].delete_many(tenant)
+    await db[EDUCATION_COLLECTION].delete_many(tenant)
+    await db[CERTIFICATIONS_COLLECTION].delete_many(tenant)
+    await ensure_tag_indexes(db)
+    await ensure_change_indexes(db)
+    await ensure_tenant_indexes(db)
     
     # Seed Skills
     skills_data = [
@@ -45,7 +55,7 @@ async def seed_database():
     ]
     
     for skill in skills_data:
-        await db[SKILLS_COLLECTION].insert_one(skill.dict())
+        await db[SKILLS_COLLECTION].insert_one(await tag_dictionary.encode(db, SKILLS_COLLECTION, {**skill.dict(), **tenant}))
     
     # Seed Projects
     projects_data = [
@@ -102,7 +112,7 @@ async def seed_database():
     ]
     
     for project in projects_data:
-        await db[PROJECTS_COLLECTION].insert_one(project.dict())
+        await db[PROJECTS_COLLECTION].insert_one(await tag_dictionary.encode(db, PROJECTS_COLLECTION, {**project.dict(), **tenant}))
     
     # Seed Experience
     experience_data = [
@@ -137,7 +147,7 @@ async def seed_database():
     ]
     
     for exp in experience_data:
-        await db[EXPERIENCE_COLLECTION].insert_one(exp.dict())
+        await db[EXPERIENCE_COLLECTION].insert_one({**exp.dict(), **tenant})
     
     # Seed Education
     education_data = [
@@ -160,7 +170,7 @@ async def seed_database():
     ]
     
     for edu in education_data:
-        await db[EDUCATION_COLLECTION].insert_one(edu.dict())
+        await db[EDUCATION_COLLECTION].insert_one({**edu.dict(), **tenant})
     
     # Seed Certifications
     certifications_data = [
@@ -171,9 +181,12 @@ async def seed_database():
     ]
     
     for cert in certifications_data:
-        await db[CERTIFICATIONS_COLLECTION].insert_one(cert.dict())
+        await db[CERTIFICATIONS_COLLECTION].insert_one({**cert.dict(), **tenant})
     
+    await refresh_stats(db, tenant_id, tag_dictionary)
+
     print("✅ Database seeded successfully with portfolio data!")
 
 if __name__ == "__main__":
-    asyncio.run(seed_database())
\ No newline at end of file
+    import sys
+    asyncio.run(seed_database(*sys.argv[1:2]))
\ No newline at end of file
@@ -1,27 +1,49 @@
-from fastapi import FastAPI, APIRouter, HTTPException
+"""
+Portfolio API
+
+Run with `uvicorn server:create_app --factory`. `server:app` still works and
+builds the app on first access.
+"""
+
+from startup import startup_report, FirstRequestTimer
+from fastapi import FastAPI, APIRouter, HTTPException, Request, Depends, Header
 from fastapi.middleware.cors import CORSMiddleware
-from dotenv import load_dotenv
+from fastapi.responses import Response, PlainTextResponse
+from contextlib import asynccontextmanager
+from bson import ObjectId
+import asyncio
 import os
 import logging
-from pathlib import Path
-from typing import List
+from typing import List, Optional
 
 # Import models and database
 from models import (
     SkillCategory, Project, Experience, Education, Certification, Contact,
     SkillCategoryCreate, ProjectCreate, ExperienceCreate, EducationCreate, 
-    CertificationCreate, ContactCreate, ApiResponse, ApiListResponse
+    CertificationCreate, ContactCreate, ApiResponse, ApiListResponse,
+    SkillCategoryOut, ProjectOut, ExperienceOut, EducationOut, CertificationOut, ContactOut,
+    ChangesOut, ApiBatchResponse, BatchRequest, StatsOut
 )
 from database import (
-    db, SKILLS_COLLECTION, PROJECTS_COLLECTION, EXPERIENCE_COLLECTION,
-    EDUCATION_COLLECTION, CERTIFICATIONS_COLLECTION, CONTACTS_COLLECTION
+    db, init_db, get_client, close_db_connection, SKILLS_COLLECTION, PROJECTS_COLLECTION,
+    EXPERIENCE_COLLECTION, EDUCATION_COLLECTION, CERTIFICATIONS_COLLECTION, CONTACTS_COLLECTION,
+    CONTACTS_ARCHIVE_COLLECTION
 )
+from profiling import request_profiler, slow_query_log, is_privileged, ensure_profiling_collections
+from logging_config import setup_logging, shutdown_logging, access_log_middleware
+from responses import list_response, item_response, batch_response, validated, validated_item
+from tags import tag_dictionary, ensure_tag_indexes
+from changes import get_changes, parse_since, ensure_change_indexes
+from archive import ARCHIVE_INTERVAL_HOURS, ensure_archive_collection, run_archive_job
+from stats import get_stats, record_contact, ensure_stats_indexes
+from tenancy import TenantMiddleware, current_tenant, scoped, HIDDEN_FIELDS, ensure_tenant_indexes
+from resilience import db_reads, mongo_breaker, mark_stale
+from idempotency import contact_dedup, DuplicateInFlight, IdempotencyKeyReused, ensure_dedup_indexes
 
-ROOT_DIR = Path(__file__).parent
-load_dotenv(ROOT_DIR / '.env')
+# Largest number of ids accepted by batch lookups
+MAX_BATCH_SIZE = int(os.environ.get('MAX_BATCH_SIZE', '100'))
 
-# Create the main app
-app = FastAPI(title="Portfolio API", version="1.0.0")
+logger = logging.getLogger(__name__)
 
 # Create a router with the /api prefix
 api_router = APIRouter(prefix="/api")
@@ -32,143 +54,395 @@ async def root():
     return {"message": "Portfolio API is running!"}
 
 # Skills endpoints
-@api_router.get("/skills", response_model=ApiListResponse)
+@api_router.get("/skills", response_model=ApiListResponse[SkillCategoryOut])
 async def get_skills():
+    async def fetch():
+        skills = await db[SKILLS_COLLECTION].find(scoped(), HIDDEN_FIELDS).to_list(1000)
+        return validated(SkillCategoryOut, await tag_dictionary.decode(db, SKILLS_COLLECTION, skills))
+
     try:
-        skills = await db[SKILLS_COLLECTION].find().to_list(1000)
-        # Convert ObjectId to string for JSON serialization
-        for skill in skills:
-            skill['_id'] = str(skill['_id'])
-        
-        return ApiListResponse(success=True, data=skills)
+        skills, stale_age = await db_reads.read("skills", fetch)
+        return mark_stale(list_response(SkillCategoryOut, skills, trusted=True), stale_age)
     except Exception as e:
-        logging.error(f"Error fetching skills: {e}")
+        logger.error("Error fetching skills: %s", e)
         raise HTTPException(status_code=500, detail="Failed to fetch skills")
 
 # Projects endpoints
-@api_router.get("/projects", response_model=ApiListResponse)
-async def get_projects():
+@api_router.get("/projects", response_model=ApiListResponse[ProjectOut])
+async def get_projects(technology: Optional[str] = None):
+    async def fetch():
+        query = {}
+        if technology:
+            # Indexed lookup of projects using a technology tag
+            tag_id = await tag_dictionary.lookup(db, technology)
+            if tag_id is None:
+                return []
+            query["technology_ids"] = tag_id
+
+        projects = await db[PROJECTS_COLLECTION].find(scoped(query), HIDDEN_FIELDS).sort("display_order", 1).to_list(1000)
+        return validated(ProjectOut, await tag_dictionary.decode(db, PROJECTS_COLLECTION, projects))
+
     try:
-        projects = await db[PROJECTS_COLLECTION].find().sort("display_order", 1).to_list(1000)
-        # Convert ObjectId to string for JSON serialization
-        for project in projects:
-            project['_id'] = str(project['_id'])
-        
-        return ApiListResponse(success=True, data=projects)
+        if technology:
+            projects, stale_age = await db_reads.read(f"projects:{technology}", fetch, partition="filtered")
+        else:
+            projects, stale_age = await db_reads.read("projects", fetch)
+        return mark_stale(list_response(ProjectOut, projects, trusted=True), stale_age)
+    except Exception as e:
+        logger.error("Error fetching projects: %s", e)
+        raise HTTPException(status_code=500, detail="Failed to fetch projects")
+
+async def get_projects_batch(ids: List[str]):
+    """Resolve many project ids with one $in query, preserving the requested order"""
+    ids = list(dict.fromkeys(project_id for project_id in ids if project_id))
+    if len(ids) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_SIZE} ids per batch")
+
+    async def fetch():
+        projects = await db[PROJECTS_COLLECTION].find(scoped({"id": {"$in": ids}}), HIDDEN_FIELDS).to_list(None)
+        projects = validated(ProjectOut, await tag_dictionary.decode(db, PROJECTS_COLLECTION, projects))
+        return {f"project:{project['id']}": project for project in projects}
+
+    try:
+        found, stale_age = await db_reads.read_many(
+            [f"project:{project_id}" for project_id in ids], fetch, partition="items"
+        )
+        projects = [found[f"project:{project_id}"] for project_id in ids if f"project:{project_id}" in found]
+        not_found = [project_id for project_id in ids if f"project:{project_id}" not in found]
+        if stale_age is None:
+            response = batch_response(ProjectOut, projects, missing=not_found, trusted=True)
+        else:
+            # Ids without a cached copy were not looked up, so they may still exist
+            response = batch_response(ProjectOut, projects, missing=[], unavailable=not_found, trusted=True)
+        return mark_stale(response, stale_age)
     except Exception as e:
-        logging.error(f"Error fetching projects: {e}")
+        logger.error("Error fetching %d projects: %s", len(ids), e)
         raise HTTPException(status_code=500, detail="Failed to fetch projects")
 
-@api_router.get("/projects/{project_id}", response_model=ApiResponse)
+@api_router.get("/projects/batch", response_model=ApiBatchResponse[ProjectOut])
+async def get_projects_batch_by_query(ids: str = ""):
+    return await get_projects_batch(ids.split(","))
+
+@api_router.post("/projects/batch", response_model=ApiBatchResponse[ProjectOut])
+async def get_projects_batch_by_body(batch: BatchRequest):
+    return await get_projects_batch(batch.ids)
+
+@api_router.get("/projects/{project_id}", response_model=ApiResponse[ProjectOut])
 async def get_project(project_id: str):
+    async def fetch():
+        project = await db[PROJECTS_COLLECTION].find_one(scoped({"id": project_id}), HIDDEN_FIELDS)
+        if project:
+            await tag_dictionary.decode(db, PROJECTS_COLLECTION, [project])
+            return validated_item(ProjectOut, project)
+        return None
+
     try:
-        project = await db[PROJECTS_COLLECTION].find_one({"id": project_id})
+        project, stale_age = await db_reads.read(f"project:{project_id}", fetch, partition="items")
         if not project:
             raise HTTPException(status_code=404, detail="Project not found")
         
-        project['_id'] = str(project['_id'])
-        return ApiResponse(success=True, data=project)
+        return mark_stale(item_response(ProjectOut, project, trusted=True), stale_age)
     except HTTPException:
         raise
     except Exception as e:
-        logging.error(f"Error fetching project {project_id}: {e}")
+        logger.error("Error fetching project %s: %s", project_id, e)
         raise HTTPException(status_code=500, detail="Failed to fetch project")
 
+# Tags endpoints
+@api_router.get("/tags", response_model=ApiListResponse)
+async def get_tags():
+    """Technology, feature and skill tags used by the current tenant"""
+    try:
+        return ApiListResponse(success=True, data=await tag_dictionary.used_by(db, current_tenant()))
+    except Exception as e:
+        logger.error("Error fetching tags: %s", e)
+        raise HTTPException(status_code=500, detail="Failed to fetch tags")
+
 # Experience endpoints
-@api_router.get("/experience", response_model=ApiListResponse)
+@api_router.get("/experience", response_model=ApiListResponse[ExperienceOut])
 async def get_experience():
+    async def fetch():
+        docs = await db[EXPERIENCE_COLLECTION].find(scoped(), HIDDEN_FIELDS).sort("display_order", 1).to_list(1000)
+        return validated(ExperienceOut, docs)
+
     try:
-        experiences = await db[EXPERIENCE_COLLECTION].find().sort("display_order", 1).to_list(1000)
-        # Convert ObjectId to string for JSON serialization
-        for exp in experiences:
-            exp['_id'] = str(exp['_id'])
-        
-        return ApiListResponse(success=True, data=experiences)
+        experiences, stale_age = await db_reads.read("experience", fetch)
+        return mark_stale(list_response(ExperienceOut, experiences, trusted=True), stale_age)
     except Exception as e:
-        logging.error(f"Error fetching experience: {e}")
+        logger.error("Error fetching experience: %s", e)
         raise HTTPException(status_code=500, detail="Failed to fetch experience")
 
 # Education endpoints
-@api_router.get("/education", response_model=ApiListResponse)
+@api_router.get("/education", response_model=ApiListResponse[EducationOut])
 async def get_education():
+    async def fetch():
+        docs = await db[EDUCATION_COLLECTION].find(scoped(), HIDDEN_FIELDS).sort("display_order", 1).to_list(1000)
+        return validated(EducationOut, docs)
+
     try:
-        education = await db[EDUCATION_COLLECTION].find().sort("display_order", 1).to_list(1000)
-        # Convert ObjectId to string for JSON serialization
-        for edu in education:
-            edu['_id'] = str(edu['_id'])
-        
-        return ApiListResponse(success=True, data=education)
+        education, stale_age = await db_reads.read("education", fetch)
+        return mark_stale(list_response(EducationOut, education, trusted=True), stale_age)
     except Exception as e:
-        logging.error(f"Error fetching education: {e}")
+        logger.error("Error fetching education: %s", e)
         raise HTTPException(status_code=500, detail="Failed to fetch education")
 
 # Certifications endpoints
-@api_router.get("/certifications", response_model=ApiListResponse)
+@api_router.get("/certifications", response_model=ApiListResponse[CertificationOut])
 async def get_certifications():
+    async def fetch():
+        docs = await db[CERTIFICATIONS_COLLECTION].find(scoped(), HIDDEN_FIELDS).sort("display_order", 1).to_list(1000)
+        return validated(CertificationOut, docs)
+
     try:
-        certifications = await db[CERTIFICATIONS_COLLECTION].find().sort("display_order", 1).to_list(1000)
-        # Convert ObjectId to string for JSON serialization
-        for cert in certifications:
-            cert['_id'] = str(cert['_id'])
-        
-        return ApiListResponse(success=True, data=certifications)
+        certifications, stale_age = await db_reads.read("certifications", fetch)
+        return mark_stale(list_response(CertificationOut, certifications, trusted=True), stale_age)
     except Exception as e:
-        logging.error(f"Error fetching certifications: {e}")
+        logger.error("Error fetching certifications: %s", e)
         raise HTTPException(status_code=500, detail="Failed to fetch certifications")
 
+# Stats endpoint
+@api_router.get("/stats", response_model=ApiResponse[StatsOut])
+async def get_portfolio_stats():
+    """Technology, skill, project status and contact submission counts"""
+    try:
+        stats = await get_stats(db, current_tenant(), tag_dictionary)
+        return item_response(StatsOut, stats)
+    except Exception as e:
+        logger.error("Error fetching stats: %s", e)
+        raise HTTPException(status_code=500, detail="Failed to fetch stats")
+
+# Change feed endpoint
+@api_router.get("/changes", response_model=ApiResponse[ChangesOut])
+async def get_changes_since(since: Optional[str] = None):
+    """Documents created, updated or deleted since a version or ISO timestamp"""
+    try:
+        since_version = parse_since(since)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid since parameter")
+
+    async def decode(collection, docs):
+        return await tag_dictionary.decode(db, collection, docs)
+
+    try:
+        changes = await get_changes(db, current_tenant(), since_version, decode)
+        return item_response(ChangesOut, changes)
+    except Exception as e:
+        logger.error("Error fetching changes since %s: %s", since, e)
+        raise HTTPException(status_code=500, detail="Failed to fetch changes")
+
 # Contact endpoints
+def contact_response(contact_id: str) -> dict:
+    return {"message": "Contact form submitted successfully!", "id": contact_id}
+
 @api_router.post("/contact", response_model=ApiResponse)
-async def create_contact(contact: ContactCreate):
+async def create_contact(contact: ContactCreate, idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key")):
+    """Submit the contact form; retries and duplicates replay the original response"""
+    tenant_id = current_tenant()
+    keys = contact_dedup.keys(contact.dict(), idempotency_key)
+    # Chosen before claiming, so a retry taking over the claim can tell whether it was stored
+    contact_id = ObjectId()
+
+    async def replay(stored_id: str) -> Optional[dict]:
+        stored = await db[CONTACTS_COLLECTION].find_one({"_id": ObjectId(stored_id), "tenant_id": tenant_id}, {"_id": 1})
+        return contact_response(stored_id) if stored else None
+
+    try:
+        original = await contact_dedup.claim(db, tenant_id, keys, str(contact_id), replay)
+        if original is not None:
+            return ApiResponse(success=True, data=original)
+    except DuplicateInFlight:
+        raise HTTPException(status_code=409, detail="Duplicate submission is still being processed")
+    except IdempotencyKeyReused:
+        raise HTTPException(status_code=422, detail="Idempotency-Key was already used for a different submission")
+    except Exception as e:
+        logger.error("Error checking contact duplicates: %s", e)
+        raise HTTPException(status_code=500, detail="Failed to submit contact form")
+
     try:
         contact_obj = Contact(**contact.dict())
-        result = await db[CONTACTS_COLLECTION].insert_one(contact_obj.dict())
-        
-        return ApiResponse(
-            success=True, 
-            data={"message": "Contact form submitted successfully!", "id": str(result.inserted_id)}
-        )
+        await db[CONTACTS_COLLECTION].insert_one({**contact_obj.dict(), "_id": contact_id, "tenant_id": tenant_id})
     except Exception as e:
-        logging.error(f"Error creating contact: {e}")
+        logger.error("Error creating contact: %s", e)
+        try:
+            await contact_dedup.release(db, tenant_id, keys)
+        except Exception as release_error:
+            # The claims lapse after their lease instead
+            logger.error("Error releasing contact claims: %s", release_error)
         raise HTTPException(status_code=500, detail="Failed to submit contact form")
 
-@api_router.get("/contacts", response_model=ApiListResponse)
+    # The contact is stored: from here on nothing may release the claim,
+    # or a retry would write it again
+    data = contact_response(str(contact_id))
+    try:
+        await contact_dedup.complete(db, tenant_id, keys, data)
+    except Exception as e:
+        # A retry after the lease finds the stored contact and replays it
+        logger.error("Error storing contact response for replay: %s", e)
+    try:
+        await record_contact(db, tenant_id, contact_obj.created_at)
+    except Exception as e:
+        # The next stats refresh counts the contact instead
+        logger.error("Error updating contact stats: %s", e)
+    return ApiResponse(success=True, data=data)
+
+@api_router.get("/contacts", response_model=ApiListResponse[ContactOut])
 async def get_contacts():
     """Admin endpoint to view contact submissions"""
     try:
-        contacts = await db[CONTACTS_COLLECTION].find().sort("created_at", -1).to_list(1000)
-        # Convert ObjectId to string for JSON serialization
-        for contact in contacts:
-            contact['_id'] = str(contact['_id'])
-        
-        return ApiListResponse(success=True, data=contacts)
+        contacts = await db[CONTACTS_COLLECTION].find(scoped(), HIDDEN_FIELDS).sort("created_at", -1).to_list(1000)
+        return list_response(ContactOut, contacts)
     except Exception as e:
-        logging.error(f"Error fetching contacts: {e}")
+        logger.error("Error fetching contacts: %s", e)
         raise HTTPException(status_code=500, detail="Failed to fetch contacts")
 
-# Include the router in the main app
-app.include_router(api_router)
+# Admin gate: requests must carry the profile token
+async def require_profile_token(request: Request):
+    if not is_privileged(request.headers):
+        raise HTTPException(status_code=403, detail="Forbidden")
 
-# CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_credentials=True,
-    allow_origins=["*"],
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+@api_router.get("/contacts/archived", response_model=ApiListResponse[ContactOut], dependencies=[Depends(require_profile_token)])
+async def get_archived_contacts(id: Optional[str] = None, email: Optional[str] = None):
+    """Admin endpoint to look up archived contact submissions by id or email"""
+    if not id and not email:
+        raise HTTPException(status_code=400, detail="Provide an id or email")
+
+    query = {"id": id} if id else {"email": email}
+    try:
+        contacts = await db[CONTACTS_ARCHIVE_COLLECTION].find(
+            scoped(query), HIDDEN_FIELDS
+        ).sort("created_at", -1).to_list(1000)
+        return list_response(ContactOut, contacts)
+    except Exception as e:
+        logger.error("Error fetching archived contacts: %s", e)
+        raise HTTPException(status_code=500, detail="Failed to fetch archived contacts")
+
+# Health endpoint
+@api_router.get("/health", response_model=ApiResponse)
+async def health():
+    """Report the Mongo circuit breaker state and startup timings"""
+    return ApiResponse(success=True, data={
+        "mongo_circuit": mongo_breaker.metrics(),
+        "startup_ms": startup_report.as_dict(),
+    })
+
+# Admin diagnostics endpoints
+@api_router.get("/admin/profiles", response_model=ApiListResponse, dependencies=[Depends(require_profile_token)])
+async def get_profiles():
+    """List captured request profiles, newest first"""
+    return ApiListResponse(success=True, data=await request_profiler.list(db))
+
+@api_router.get("/admin/profiles/{profile_id}", dependencies=[Depends(require_profile_token)])
+async def download_profile(profile_id: str, format: str = "prof"):
+    """Download a profile as a pstats file, or as a text report with format=text"""
+    profile = await request_profiler.get(db, profile_id)
+    if not profile:
+        raise HTTPException(status_code=404, detail="Profile not found")
+
+    if format == "text":
+        return PlainTextResponse(request_profiler.to_text(profile["stats"]))
+    return Response(
+        content=profile["stats"],
+        media_type="application/octet-stream",
+        headers={"Content-Disposition": f'attachment; filename="{profile_id}.prof"'}
+    )
+
+@api_router.get("/admin/slow-queries", response_model=ApiListResponse, dependencies=[Depends(require_profile_token)])
+async def get_slow_queries():
+    """List Mongo operations that exceeded the slow query threshold"""
+    return ApiListResponse(success=True, data=await slow_query_log.list(db))
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+# Profiling middleware
+async def profile_requests(request: Request, call_next):
+    if not request_profiler.should_profile(request.headers):
+        return await call_next(request)
+    return await request_profiler.profile(db, request, call_next)
+
+# Unique indexes that request handling relies on for correctness: dedup
+# claims, tag creation and per-tenant ids. Startup fails without them.
+REQUIRED_INDEXES = (ensure_dedup_indexes, ensure_tag_indexes, ensure_tenant_indexes)
+# Seconds to wait for the required indexes before giving up on startup
+REQUIRED_INDEXES_TIMEOUT = float(os.environ.get('REQUIRED_INDEXES_TIMEOUT', '10'))
+# Lookup and housekeeping indexes, created in the background
+BACKGROUND_INDEXES = (
+    ensure_change_indexes, ensure_stats_indexes, ensure_archive_collection, ensure_profiling_collections,
 )
-logger = logging.getLogger(__name__)
 
-@app.on_event("shutdown")
-async def shutdown_event():
-    from database import close_db_connection
+async def ensure_required_indexes():
+    """Create the required indexes concurrently, raising if any fails or they time out"""
+    try:
+        await asyncio.wait_for(
+            asyncio.gather(*(ensure(db) for ensure in REQUIRED_INDEXES)), REQUIRED_INDEXES_TIMEOUT
+        )
+    except Exception as e:
+        logger.error("Required indexes unavailable, refusing to start: %r", e)
+        raise
+
+async def ensure_indexes(steps):
+    # Each step on its own, so one failure does not skip the rest
+    for ensure in steps:
+        try:
+            await ensure(db)
+        except Exception as e:
+            logger.error("Error in %s: %s", ensure.__name__, e)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    init_db()
+    slow_query_log.attach(get_client(), asyncio.get_running_loop())
+    await ensure_required_indexes()
+    tasks = [asyncio.create_task(ensure_indexes(BACKGROUND_INDEXES))]
+    if ARCHIVE_INTERVAL_HOURS > 0:
+        tasks.append(asyncio.create_task(run_archive_job(db)))
+    startup_report.mark("lifespan_ready")
+
+    yield
+
+    for task in tasks:
+        task.cancel()
     await close_db_connection()
+    shutdown_logging()
+
+def create_app() -> FastAPI:
+    """Build the API app; the database client is created in lifespan"""
+    startup_report.mark("imported")
+    setup_logging()
+
+    app = FastAPI(title="Portfolio API", version="1.0.0", lifespan=lifespan)
+    app.include_router(api_router)
+
+    app.middleware("http")(profile_requests)
+
+    # Access logging middleware, wrapping profiling so latency includes it
+    app.middleware("http")(access_log_middleware)
+
+    # CORS middleware
+    app.add_middleware(
+        CORSMiddleware,
+        allow_credentials=True,
+        allow_origins=["*"],
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+    # Tenant resolution, outermost so /t/<tenant> prefixes are stripped before routing
+    app.add_middleware(TenantMiddleware)
+
+    app.add_middleware(FirstRequestTimer, report=startup_report)
+    startup_report.mark("app_created")
+    return app
+
+_app = None
+
+def __getattr__(name):
+    # Keeps `uvicorn server:app` working without building the app at import
+    global _app
+    if name == "app":
+        if _app is None:
+            _app = create_app()
+        return _app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8001)
\ No newline at end of file
+    # log_config=None keeps uvicorn from reinstalling its synchronous handlers
+    uvicorn.run(create_app(), host="0.0.0.0", port=8001, log_config=None)
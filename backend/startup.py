@@ -0,0 +1,57 @@
+"""
+Startup timing report
+
+server.py imports this module first, so timings are measured from the start
+of the server import. Each phase records milliseconds since then:
+
+    imported        server.py and its dependencies finished importing
+    app_created     create_app() returned
+    lifespan_ready  lifespan startup finished and the app accepts requests
+    first_request   the first HTTP request completed
+
+The report is logged once the first request completes and is included in
+/api/health. bench_startup.py breaks the import phase down per module.
+"""
+
+import logging
+import time
+from typing import Dict
+
+logger = logging.getLogger(__name__)
+
+
+class StartupReport:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases: Dict[str, float] = {}
+
+    def mark(self, phase: str) -> bool:
+        """Record a phase the first time it is reached, returning whether it was new"""
+        if phase in self.phases:
+            return False
+        self.phases[phase] = round((time.perf_counter() - self.started) * 1000, 3)
+        return True
+
+    def as_dict(self) -> Dict[str, float]:
+        return dict(self.phases)
+
+
+class FirstRequestTimer:
+    """ASGI middleware that marks and logs when the first HTTP request completes"""
+
+    def __init__(self, app, report: StartupReport):
+        self.app = app
+        self.report = report
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or "first_request" in self.report.phases:
+            await self.app(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            if self.report.mark("first_request"):
+                logger.info("Startup complete", extra={"startup_ms": self.report.as_dict()})
+
+
+startup_report = StartupReport()
@@ -0,0 +1,178 @@
+import os
+import time
+from datetime import datetime, timedelta
+from collections import Counter, OrderedDict
+from typing import Dict, Optional, Tuple
+
+from database import (
+    SKILLS_COLLECTION, PROJECTS_COLLECTION, CONTACTS_COLLECTION, CONTACTS_ARCHIVE_COUNTS_COLLECTION,
+    STATS_COLLECTION
+)
+
+# Stats configuration
+STATS_CACHE_TTL = float(os.environ.get('STATS_CACHE_TTL', '60'))
+STATS_CACHE_SIZE = int(os.environ.get('STATS_CACHE_SIZE', '1000'))
+# Project and skill counts are recomputed when the stored view is older than this
+STATS_MAX_AGE = float(os.environ.get('STATS_MAX_AGE', '3600'))
+
+
+def day_key(value: datetime) -> str:
+    return value.strftime("%Y-%m-%d")
+
+
+def week_key(value: datetime) -> str:
+    year, week, _ = value.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+async def technology_counts(db, tenant_id: str, tag_dictionary) -> list:
+    pipeline = [
+        {"$match": {"tenant_id": tenant_id}},
+        {"$unwind": "$technology_ids"},
+        {"$group": {"_id": "$technology_ids", "count": {"$sum": 1}}},
+        {"$sort": {"count": -1, "_id": 1}},
+    ]
+    rows = await db[PROJECTS_COLLECTION].aggregate(pipeline).to_list(None)
+    names = await tag_dictionary.name_map(db, [row["_id"] for row in rows])
+    # Dangling ids have no name and are left out rather than shifting the others
+    return [{"name": names[row["_id"]], "count": row["count"]} for row in rows if row["_id"] in names]
+
+
+async def skills_per_category(db, tenant_id: str) -> Dict[str, int]:
+    pipeline = [
+        {"$match": {"tenant_id": tenant_id}},
+        {"$group": {"_id": "$category", "count": {"$sum": {"$size": "$skill_ids"}}}},
+    ]
+    rows = await db[SKILLS_COLLECTION].aggregate(pipeline).to_list(None)
+    return {row["_id"]: row["count"] for row in rows}
+
+
+async def projects_by_status(db, tenant_id: str) -> Dict[str, int]:
+    pipeline = [
+        {"$match": {"tenant_id": tenant_id}},
+        {"$group": {"_id": "$status", "count": {"$sum": 1}}},
+    ]
+    rows = await db[PROJECTS_COLLECTION].aggregate(pipeline).to_list(None)
+    return {row["_id"]: row["count"] for row in rows}
+
+
+async def contact_buckets(db, tenant_id: str) -> Tuple[Dict[str, int], Dict[str, int]]:
+    """Count contact submissions per day and per ISO week.
+
+    Hot contacts are counted row by row; archived ones come from the per-day
+    counts kept by archive.py, so the archive itself is never scanned.
+    """
+    per_day, per_week = Counter(), Counter()
+    docs = await db[CONTACTS_COLLECTION].find(
+        {"tenant_id": tenant_id}, {"_id": 0, "created_at": 1}
+    ).to_list(None)
+    if docs:
+        import pandas as pd  # Imported on first use; it dominates server import time
+        created = pd.DataFrame(docs)["created_at"]
+        per_day.update({key: int(count) for key, count in created.dt.strftime("%Y-%m-%d").value_counts().items()})
+        iso = created.dt.isocalendar()
+        weeks = iso["year"].astype(str) + "-W" + iso["week"].astype(str).str.zfill(2)
+        per_week.update({key: int(count) for key, count in weeks.value_counts().items()})
+
+    async for row in db[CONTACTS_ARCHIVE_COUNTS_COLLECTION].find({"tenant_id": tenant_id}, {"_id": 0}):
+        per_day[row["day"]] += row["count"]
+        per_week[row["week"]] += row["count"]
+    return dict(sorted(per_day.items())), dict(sorted(per_week.items()))
+
+
+async def has_content(db, tenant_id: str) -> bool:
+    """Whether a tenant has any projects, skills or contacts, hot or archived"""
+    for collection in (PROJECTS_COLLECTION, SKILLS_COLLECTION, CONTACTS_COLLECTION, CONTACTS_ARCHIVE_COUNTS_COLLECTION):
+        if await db[collection].find_one({"tenant_id": tenant_id}, {"_id": 1}) is not None:
+            return True
+    return False
+
+
+def empty_stats() -> dict:
+    return {
+        "technologies": [], "skills_per_category": {}, "projects_by_status": {},
+        "contacts_per_day": {}, "contacts_per_week": {}, "computed_at": datetime.utcnow(),
+    }
+
+
+async def refresh_stats(db, tenant_id: str, tag_dictionary) -> dict:
+    """Recompute a tenant's stats and store them as its materialized view"""
+    contacts_per_day, contacts_per_week = await contact_buckets(db, tenant_id)
+    stats = {
+        "technologies": await technology_counts(db, tenant_id, tag_dictionary),
+        "skills_per_category": await skills_per_category(db, tenant_id),
+        "projects_by_status": await projects_by_status(db, tenant_id),
+        "contacts_per_day": contacts_per_day,
+        "contacts_per_week": contacts_per_week,
+        "computed_at": datetime.utcnow(),
+    }
+    await db[STATS_COLLECTION].replace_one({"tenant_id": tenant_id}, {"tenant_id": tenant_id, **stats}, upsert=True)
+    return stats
+
+
+class StatsCache:
+    """Serves each tenant's stats view from memory for STATS_CACHE_TTL seconds,
+    keeping at most max_entries tenants and evicting the least recently used"""
+
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[dict, float]]" = OrderedDict()
+
+    def get(self, tenant_id: str) -> Optional[dict]:
+        entry = self._entries.get(tenant_id)
+        if entry and time.monotonic() - entry[1] < self.ttl:
+            self._entries.move_to_end(tenant_id)
+            return entry[0]
+        return None
+
+    def set(self, tenant_id: str, stats: dict):
+        self._entries[tenant_id] = (stats, time.monotonic())
+        self._entries.move_to_end(tenant_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, tenant_id: str):
+        self._entries.pop(tenant_id, None)
+
+
+async def get_stats(db, tenant_id: str, tag_dictionary) -> dict:
+    """Return stats from cache, then from the stored view, refreshing it when stale.
+
+    Tenants without any content get empty stats that are neither stored nor
+    cached, so requests for made-up tenants cannot grow either.
+    """
+    stats = stats_cache.get(tenant_id)
+    if stats is not None:
+        return stats
+
+    stats = await db[STATS_COLLECTION].find_one({"tenant_id": tenant_id}, {"_id": 0, "tenant_id": 0})
+    if stats is None and not await has_content(db, tenant_id):
+        return empty_stats()
+    if stats is None or datetime.utcnow() - stats["computed_at"] > timedelta(seconds=STATS_MAX_AGE):
+        stats = await refresh_stats(db, tenant_id, tag_dictionary)
+    stats_cache.set(tenant_id, stats)
+    return stats
+
+
+async def record_contact(db, tenant_id: str, created_at: datetime):
+    """Incrementally update the stored view for a new contact submission.
+
+    Nothing is written if the view has not been computed yet; the first
+    refresh counts the contact instead.
+    """
+    await db[STATS_COLLECTION].update_one(
+        {"tenant_id": tenant_id},
+        {"$inc": {
+            f"contacts_per_day.{day_key(created_at)}": 1,
+            f"contacts_per_week.{week_key(created_at)}": 1,
+        }}
+    )
+    stats_cache.invalidate(tenant_id)
+
+
+async def ensure_stats_indexes(db):
+    await db[STATS_COLLECTION].create_index("tenant_id", unique=True)
+
+
+stats_cache = StatsCache(STATS_CACHE_TTL, STATS_CACHE_SIZE)
@@ -0,0 +1,147 @@
+import asyncio
+import logging
+import sys
+from typing import Dict, Iterable, List, Set
+
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from database import (
+    SKILLS_COLLECTION, PROJECTS_COLLECTION, TAGS_COLLECTION, COUNTERS_COLLECTION
+)
+
+# Free-text list fields stored as tag ids, per collection: name field -> id field
+TAGGED_FIELDS = {
+    PROJECTS_COLLECTION: {"technologies": "technology_ids", "features": "feature_ids"},
+    SKILLS_COLLECTION: {"skills": "skill_ids"},
+}
+
+logger = logging.getLogger(__name__)
+
+
+class TagDictionary:
+    """In-memory, interned map between tag names and their compact integer ids.
+
+    The tags collection is the source of truth. The map is loaded lazily and
+    reloaded when an unknown id is seen, so tags created by other workers
+    are picked up. Ids still unknown after a reload are dangling; they are
+    remembered and skipped without reloading again until a tag is created.
+    """
+
+    def __init__(self):
+        self._by_name: Dict[str, int] = {}
+        self._by_id: Dict[int, str] = {}
+        self._unknown: Set[int] = set()
+        self._loaded = False
+        self._lock = asyncio.Lock()
+
+    def _add(self, tag_id: int, name: str):
+        name = sys.intern(name)
+        self._by_name[name] = tag_id
+        self._by_id[tag_id] = name
+
+    async def load(self, db):
+        """(Re)load the whole dictionary from the tags collection"""
+        tags = await db[TAGS_COLLECTION].find({}, {"_id": 0, "id": 1, "name": 1}).to_list(None)
+        self._by_name.clear()
+        self._by_id.clear()
+        for tag in tags:
+            self._add(tag["id"], tag["name"])
+        self._loaded = True
+
+    async def _ensure_loaded(self, db):
+        if not self._loaded:
+            async with self._lock:
+                if not self._loaded:
+                    await self.load(db)
+
+    async def lookup(self, db, name: str):
+        """Return the id for a tag name, or None if it does not exist"""
+        await self._ensure_loaded(db)
+        if name not in self._by_name:
+            tag = await db[TAGS_COLLECTION].find_one({"name": name}, {"_id": 0})
+            if tag:
+                self._add(tag["id"], tag["name"])
+        return self._by_name.get(name)
+
+    async def ids_for(self, db, names: Iterable[str]) -> List[int]:
+        """Return ids for tag names, creating any tags that do not exist yet"""
+        await self._ensure_loaded(db)
+        ids = []
+        for name in names:
+            tag_id = self._by_name.get(name)
+            if tag_id is None:
+                tag_id = await self._create(db, name)
+            ids.append(tag_id)
+        return ids
+
+    async def _create(self, db, name: str) -> int:
+        counter = await db[COUNTERS_COLLECTION].find_one_and_update(
+            {"_id": TAGS_COLLECTION}, {"$inc": {"seq": 1}},
+            upsert=True, return_document=ReturnDocument.AFTER
+        )
+        try:
+            await db[TAGS_COLLECTION].insert_one({"id": counter["seq"], "name": name})
+            self._add(counter["seq"], name)
+            self._unknown.clear()
+        except DuplicateKeyError:
+            # Another worker created the same tag first
+            tag = await db[TAGS_COLLECTION].find_one({"name": name}, {"_id": 0})
+            self._add(tag["id"], tag["name"])
+        return self._by_name[name]
+
+    async def names_for(self, db, ids: Iterable[int]) -> List[str]:
+        """Resolve tag ids to their interned names"""
+        await self._ensure_loaded(db)
+        ids = list(ids)
+        if any(tag_id not in self._by_id and tag_id not in self._unknown for tag_id in ids):
+            async with self._lock:
+                await self.load(db)
+            dangling = {tag_id for tag_id in ids if tag_id not in self._by_id} - self._unknown
+            if dangling:
+                logger.warning("Unknown tag ids %s, skipping them", sorted(dangling))
+                self._unknown |= dangling
+        return [self._by_id[tag_id] for tag_id in ids if tag_id in self._by_id]
+
+    async def name_map(self, db, ids: Iterable[int]) -> Dict[int, str]:
+        """Map tag ids to names, leaving out dangling ids"""
+        ids = list(ids)
+        await self.names_for(db, ids)
+        return {tag_id: self._by_id[tag_id] for tag_id in ids if tag_id in self._by_id}
+
+    async def encode(self, db, collection: str, doc: dict) -> dict:
+        """Replace tagged name lists in a document with id lists for storage"""
+        doc = dict(doc)
+        for name_field, id_field in TAGGED_FIELDS.get(collection, {}).items():
+            if name_field in doc:
+                doc[id_field] = await self.ids_for(db, doc.pop(name_field))
+        return doc
+
+    async def decode(self, db, collection: str, docs: List[dict]) -> List[dict]:
+        """Replace stored id lists with tag names, in place"""
+        for doc in docs:
+            for name_field, id_field in TAGGED_FIELDS.get(collection, {}).items():
+                if id_field in doc:
+                    doc[name_field] = await self.names_for(db, doc.pop(id_field))
+        return docs
+
+    async def used_by(self, db, tenant_id: str) -> List[dict]:
+        """Tags referenced by a tenant's documents, served from the (tenant_id, id_field) indexes"""
+        ids = set()
+        for collection, fields in TAGGED_FIELDS.items():
+            for id_field in fields.values():
+                ids.update(await db[collection].distinct(id_field, {"tenant_id": tenant_id}))
+        names = await self.name_map(db, sorted(ids))
+        return [{"id": tag_id, "name": name} for tag_id, name in names.items()]
+
+
+async def ensure_tag_indexes(db):
+    """Create the indexes backing tag lookups"""
+    await db[TAGS_COLLECTION].create_index("id", unique=True)
+    await db[TAGS_COLLECTION].create_index("name", unique=True)
+    for collection, fields in TAGGED_FIELDS.items():
+        for id_field in fields.values():
+            await db[collection].create_index([("tenant_id", 1), (id_field, 1)])
+
+
+tag_dictionary = TagDictionary()
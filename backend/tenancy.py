@@ -0,0 +1,100 @@
+import contextvars
+import os
+import re
+from typing import Optional
+
+from database import (
+    SKILLS_COLLECTION, PROJECTS_COLLECTION, EXPERIENCE_COLLECTION,
+    EDUCATION_COLLECTION, CERTIFICATIONS_COLLECTION, CONTACTS_COLLECTION
+)
+
+# Tenancy configuration
+DEFAULT_TENANT = os.environ.get('DEFAULT_TENANT', 'default')
+# Requests to <tenant>.<TENANT_BASE_DOMAIN> are served for <tenant>
+TENANT_BASE_DOMAIN = os.environ.get('TENANT_BASE_DOMAIN', '').lower()
+# Custom domains, e.g. "janedoe.dev=jane,portfolio.example.org=acme"
+TENANT_HOSTS = dict(
+    pair.split("=", 1) for pair in os.environ.get('TENANT_HOSTS', '').split(",") if "=" in pair
+)
+# Requests to /t/<tenant>/api/... are served for <tenant> as /api/...
+TENANT_PATH_PREFIX = "/t/"
+
+TENANT_ID_PATTERN = re.compile(r"^[a-z0-9](?:[a-z0-9-]{0,61}[a-z0-9])?$")
+
+# Collections whose documents belong to a tenant
+TENANT_COLLECTIONS = (
+    SKILLS_COLLECTION, PROJECTS_COLLECTION, EXPERIENCE_COLLECTION,
+    EDUCATION_COLLECTION, CERTIFICATIONS_COLLECTION, CONTACTS_COLLECTION,
+)
+
+# Fields never returned to clients
+HIDDEN_FIELDS = {"_id": 0, "tenant_id": 0}
+
+current_tenant_var: contextvars.ContextVar[str] = contextvars.ContextVar(
+    "current_tenant", default=DEFAULT_TENANT
+)
+
+
+def current_tenant() -> str:
+    return current_tenant_var.get()
+
+
+def scoped(query: Optional[dict] = None) -> dict:
+    """Restrict a query to the current tenant"""
+    return {**(query or {}), "tenant_id": current_tenant()}
+
+
+def tenant_from_host(host: str) -> Optional[str]:
+    host = host.split(":", 1)[0].lower()
+    if host in TENANT_HOSTS:
+        return TENANT_HOSTS[host]
+    if TENANT_BASE_DOMAIN and host.endswith("." + TENANT_BASE_DOMAIN):
+        return host[:-len(TENANT_BASE_DOMAIN) - 1]
+    return None
+
+
+class TenantMiddleware:
+    """Resolves the tenant from a /t/<tenant> path prefix or the Host header.
+
+    The prefix is stripped so routes are shared by all tenants. Requests for
+    a malformed tenant id are rejected with 404.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        tenant = None
+        path = scope["path"]
+        if path.startswith(TENANT_PATH_PREFIX):
+            tenant, _, rest = path[len(TENANT_PATH_PREFIX):].partition("/")
+            scope = dict(scope, path="/" + rest, raw_path=("/" + rest).encode())
+        else:
+            headers = dict(scope.get("headers") or [])
+            host = headers.get(b"host", b"").decode("latin-1")
+            tenant = tenant_from_host(host)
+
+        tenant = tenant or DEFAULT_TENANT
+        if not TENANT_ID_PATTERN.match(tenant):
+            await send({"type": "http.response.start", "status": 404,
+                        "headers": [(b"content-type", b"application/json")]})
+            await send({"type": "http.response.body", "body": b'{"detail":"Tenant not found"}'})
+            return
+
+        token = current_tenant_var.set(tenant)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            current_tenant_var.reset(token)
+
+
+async def ensure_tenant_indexes(db):
+    """Create compound indexes leading with tenant_id for tenant-scoped queries"""
+    for collection in TENANT_COLLECTIONS:
+        await db[collection].create_index([("tenant_id", 1), ("id", 1)], unique=True)
+    for collection in (PROJECTS_COLLECTION, EXPERIENCE_COLLECTION, EDUCATION_COLLECTION, CERTIFICATIONS_COLLECTION):
+        await db[collection].create_index([("tenant_id", 1), ("display_order", 1)])
+    await db[CONTACTS_COLLECTION].create_index([("tenant_id", 1), ("created_at", -1)])
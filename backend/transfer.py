@@ -0,0 +1,175 @@
+"""
+Bulk import and export of all collections as gzip-compressed JSONL
+
+Documents are streamed one batch at a time, so memory use stays constant
+regardless of collection size. Imports upsert by _id with unordered
+bulk_write batches and record a checkpoint after every batch; re-running an
+interrupted import with the same checkpoint file resumes where it stopped.
+The checkpoint records each dump file's size and mtime, and resuming
+against a file that has since changed is refused.
+
+Usage:
+    python transfer.py export ./dump
+    python transfer.py import ./dump --checkpoint ./dump/.checkpoint.json
+"""
+
+import asyncio
+import gzip
+import json
+import os
+import time
+from pathlib import Path
+from typing import List, Optional
+
+import typer
+from bson import json_util
+from pymongo import ReplaceOne
+
+from database import (
+    db, SKILLS_COLLECTION, PROJECTS_COLLECTION, EXPERIENCE_COLLECTION,
+    EDUCATION_COLLECTION, CERTIFICATIONS_COLLECTION, CONTACTS_COLLECTION,
+    CONTACTS_ARCHIVE_COLLECTION, CONTACTS_ARCHIVE_COUNTS_COLLECTION, TAGS_COLLECTION, COUNTERS_COLLECTION,
+    TOMBSTONES_COLLECTION
+)
+
+ALL_COLLECTIONS = [
+    SKILLS_COLLECTION, PROJECTS_COLLECTION, EXPERIENCE_COLLECTION, EDUCATION_COLLECTION,
+    CERTIFICATIONS_COLLECTION, CONTACTS_COLLECTION, CONTACTS_ARCHIVE_COLLECTION,
+    CONTACTS_ARCHIVE_COUNTS_COLLECTION, TAGS_COLLECTION, COUNTERS_COLLECTION, TOMBSTONES_COLLECTION,
+]
+DEFAULT_BATCH_SIZE = 1000
+JSON_OPTIONS = json_util.RELAXED_JSON_OPTIONS
+
+cli = typer.Typer(help="Bulk import and export of portfolio collections")
+
+
+def dump_path(directory: Path, collection: str) -> Path:
+    return directory / f"{collection}.jsonl.gz"
+
+
+def report(collection: str, count: int, elapsed: float):
+    rate = count / elapsed if elapsed > 0 else 0
+    print(f"✅ {collection}: {count} documents in {elapsed:.2f}s ({rate:,.0f} docs/s)")
+
+
+class CheckpointMismatch(Exception):
+    """Raised when a checkpoint was recorded against a different dump file"""
+
+
+def fingerprint(path: Path) -> dict:
+    stat = path.stat()
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+class Checkpoint:
+    """Number of lines already imported per file, persisted after every batch"""
+
+    def __init__(self, path: Optional[Path]):
+        self.path = path
+        self.done = json.loads(path.read_text()) if path and path.exists() else {}
+
+    def get(self, collection: str, dump: Path) -> int:
+        entry = self.done.get(collection)
+        if entry is None:
+            return 0
+        if not isinstance(entry, dict) or entry.get("file") != fingerprint(dump):
+            raise CheckpointMismatch(
+                f"{dump} changed since the checkpoint was written; delete the checkpoint to import it from the start"
+            )
+        return entry["lines"]
+
+    def save(self, collection: str, dump: Path, lines: int):
+        self.done[collection] = {"lines": lines, "file": fingerprint(dump)}
+        if self.path:
+            # Write then rename so a crash never leaves a truncated checkpoint
+            tmp = self.path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(self.done))
+            os.replace(tmp, self.path)
+
+
+async def export_collection(collection: str, directory: Path, batch_size: int) -> int:
+    count = 0
+    with gzip.open(dump_path(directory, collection), "wt", encoding="utf-8") as out:
+        async for doc in db[collection].find({}, batch_size=batch_size):
+            out.write(json_util.dumps(doc, json_options=JSON_OPTIONS))
+            out.write("\n")
+            count += 1
+    return count
+
+
+async def import_collection(collection: str, directory: Path, batch_size: int, checkpoint: Checkpoint) -> int:
+    path = dump_path(directory, collection)
+    if not path.exists():
+        return 0
+
+    skip = checkpoint.get(collection, path)
+    lines = imported = 0
+    batch: List[ReplaceOne] = []
+    with gzip.open(path, "rt", encoding="utf-8") as source:
+        for line in source:
+            lines += 1
+            if lines <= skip or not line.strip():
+                continue
+            doc = json_util.loads(line, json_options=JSON_OPTIONS)
+            batch.append(ReplaceOne({"_id": doc["_id"]}, doc, upsert=True))
+            if len(batch) >= batch_size:
+                await db[collection].bulk_write(batch, ordered=False)
+                imported += len(batch)
+                batch = []
+                checkpoint.save(collection, path, lines)
+        if batch:
+            await db[collection].bulk_write(batch, ordered=False)
+            imported += len(batch)
+        checkpoint.save(collection, path, lines)
+    return imported
+
+
+@cli.command("export")
+def export_command(
+    directory: Path = typer.Argument(..., help="Directory to write <collection>.jsonl.gz files to"),
+    collection: Optional[List[str]] = typer.Option(None, help="Only export these collections"),
+    batch_size: int = typer.Option(DEFAULT_BATCH_SIZE, help="Documents fetched per cursor batch"),
+):
+    """Export collections to compressed JSONL"""
+    directory.mkdir(parents=True, exist_ok=True)
+
+    async def run():
+        total, start = 0, time.perf_counter()
+        for name in collection or ALL_COLLECTIONS:
+            started = time.perf_counter()
+            count = await export_collection(name, directory, batch_size)
+            report(name, count, time.perf_counter() - started)
+            total += count
+        report("total", total, time.perf_counter() - start)
+
+    asyncio.run(run())
+
+
+@cli.command("import")
+def import_command(
+    directory: Path = typer.Argument(..., help="Directory containing <collection>.jsonl.gz files"),
+    collection: Optional[List[str]] = typer.Option(None, help="Only import these collections"),
+    batch_size: int = typer.Option(DEFAULT_BATCH_SIZE, help="Upserts per bulk_write"),
+    checkpoint: Optional[Path] = typer.Option(None, help="Checkpoint file used to resume an interrupted import"),
+):
+    """Import compressed JSONL, upserting documents by _id"""
+    progress = Checkpoint(checkpoint)
+
+    async def run():
+        total, start = 0, time.perf_counter()
+        for name in collection or ALL_COLLECTIONS:
+            started = time.perf_counter()
+            try:
+                count = await import_collection(name, directory, batch_size, progress)
+            except CheckpointMismatch as e:
+                print(f"❌ {e}")
+                raise typer.Exit(1)
+            report(name, count, time.perf_counter() - started)
+            total += count
+        report("total", total, time.perf_counter() - start)
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,59 @@
+"""
+In-process test harness for the Portfolio API
+
+Drives the FastAPI app over an ASGI transport against an in-memory Mongo
+stand-in seeded from seed_data.py, so no deployed backend or database is
+needed. Each test gets its own database and fresh module state, which lets
+pytest-xdist run tests in parallel. Latency budgets are checked separately
+by test_latency.py, which only runs with `pytest -m latency`.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import httpx
+import pytest
+from mongomock_motor import AsyncMongoMockClient
+
+BACKEND_DIR = Path(__file__).parent.parent / 'backend'
+sys.path.insert(0, str(BACKEND_DIR))
+os.environ.setdefault('MONGO_URL', 'mongodb://localhost:27017')
+os.environ.setdefault('DB_NAME', 'portfolio_test')
+
+import seed_data  # noqa: E402
+import server  # noqa: E402
+from idempotency import Deduplicator, ensure_dedup_indexes  # noqa: E402
+from resilience import CircuitBreaker, StaleWhileErrorReader  # noqa: E402
+import stats  # noqa: E402
+from tags import TagDictionary  # noqa: E402
+
+@pytest.fixture
+async def mongo(monkeypatch):
+    """In-memory database seeded with the portfolio data"""
+    db = AsyncMongoMockClient()['portfolio_test']
+    tag_dictionary = TagDictionary()
+    for module in (server, seed_data):
+        monkeypatch.setattr(module, 'db', db)
+        monkeypatch.setattr(module, 'tag_dictionary', tag_dictionary)
+
+    breaker = CircuitBreaker("mongo", failure_threshold=2, reset_timeout=60)
+    monkeypatch.setattr(server, 'mongo_breaker', breaker)
+    monkeypatch.setattr(server, 'db_reads', StaleWhileErrorReader(
+        breaker, timeout_ms=1000, max_entries=100, max_per_tenant=20
+    ))
+
+    monkeypatch.setattr(stats, 'stats_cache', stats.StatsCache(ttl=60, max_entries=100))
+    monkeypatch.setattr(server, 'contact_dedup', Deduplicator(max_entries=100, key_ttl=3600, content_window=600))
+    await ensure_dedup_indexes(db)
+
+    await seed_data.seed_database()
+    return db
+
+
+@pytest.fixture
+async def api(mongo):
+    """Client bound to the app in-process"""
+    transport = httpx.ASGITransport(app=server.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
@@ -0,0 +1,377 @@
+"""
+Portfolio API endpoint tests
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+import seed_data
+import server
+import stats as stats_module
+from changes import to_version
+
+
+def assert_success_list(response):
+    assert response.status_code == 200
+    body = response.json()
+    assert body["success"] is True
+    assert isinstance(body["data"], list)
+    return body["data"]
+
+
+async def test_root(api):
+    response = await api.get("/api/")
+    assert response.json() == {"message": "Portfolio API is running!"}
+
+
+async def test_skills_endpoint(api):
+    data = assert_success_list(await api.get("/api/skills"))
+    categories = {skill["category"] for skill in data}
+    assert categories == {"serviceNow", "technical", "emerging"}
+    technical = next(skill for skill in data if skill["category"] == "technical")
+    assert "JavaScript" in technical["skills"]
+
+
+async def test_projects_endpoint(api):
+    data = assert_success_list(await api.get("/api/projects"))
+    titles = [project["title"].lower() for project in data]
+    for expected in ("fasu", "arms", "cancer detection"):
+        assert any(expected in title for title in titles)
+    assert [project["display_order"] for project in data] == sorted(p["display_order"] for p in data)
+    assert all("_id" not in project for project in data)
+
+
+async def test_projects_by_technology(api):
+    data = assert_success_list(await api.get("/api/projects?technology=Python"))
+    assert [project["title"] for project in data] == ["Cancer Detection using Computer Vision"]
+
+    data = assert_success_list(await api.get("/api/projects?technology=COBOL"))
+    assert data == []
+
+
+async def test_project_detail_endpoint(api):
+    projects = assert_success_list(await api.get("/api/projects"))
+    project_id = projects[0]["id"]
+
+    response = await api.get(f"/api/projects/{project_id}")
+    assert response.status_code == 200
+    assert response.json()["data"]["title"] == projects[0]["title"]
+
+    response = await api.get("/api/projects/invalid-id")
+    assert response.status_code == 404
+
+
+async def test_experience_endpoint(api):
+    data = assert_success_list(await api.get("/api/experience"))
+    assert data
+    for job in data:
+        assert job["company"] and job["position"] and isinstance(job["achievements"], list)
+
+
+async def test_education_endpoint(api):
+    data = assert_success_list(await api.get("/api/education"))
+    institutions = [edu["institution"].lower() for edu in data]
+    for expected in ("drexel", "hmr institute"):
+        assert any(expected in institution for institution in institutions)
+
+
+async def test_certifications_endpoint(api):
+    data = assert_success_list(await api.get("/api/certifications"))
+    assert any("CSA" in cert["name"] for cert in data)
+
+
+async def test_contact_post_endpoint(api):
+    contact = {
+        "name": "Jane Doe",
+        "email": "jane@example.com",
+        "subject": "Project inquiry",
+        "message": "I'd like to discuss a ServiceNow project.",
+    }
+    response = await api.post("/api/contact", json=contact)
+    assert response.status_code == 200
+    assert response.json()["data"]["id"]
+
+    contacts = assert_success_list(await api.get("/api/contacts"))
+    assert [c["email"] for c in contacts] == ["jane@example.com"]
+
+
+async def test_contact_retry_with_idempotency_key_replays_response(api, mongo):
+    contact = {"name": "Jane", "email": "jane@example.com", "subject": "Hi", "message": "Hello"}
+    headers = {"Idempotency-Key": "retry-1"}
+    first = await api.post("/api/contact", json=contact, headers=headers)
+    server.contact_dedup._recent.clear()  # Force the Mongo fallback path
+    retry = await api.post("/api/contact", json=contact, headers=headers)
+
+    assert retry.status_code == 200
+    assert retry.json()["data"] == first.json()["data"]
+    assert await mongo.contacts.count_documents({}) == 1
+
+
+async def test_contact_duplicate_content_is_suppressed(api, mongo):
+    contact = {"name": "Jane", "email": "jane@example.com", "subject": "Hi", "message": "Hello"}
+    first = await api.post("/api/contact", json=contact)
+    again = await api.post("/api/contact", json={**contact, "email": "JANE@example.com", "message": " Hello "},
+                           headers={"Idempotency-Key": "other"})
+    assert again.json()["data"] == first.json()["data"]
+
+    different = await api.post("/api/contact", json={**contact, "message": "Something else"})
+    assert different.json()["data"]["id"] != first.json()["data"]["id"]
+    assert await mongo.contacts.count_documents({}) == 2
+
+
+async def test_contact_stats_failure_does_not_release_claim(api, mongo, monkeypatch):
+    async def failing_record_contact(*args):
+        raise RuntimeError("stats unavailable")
+
+    monkeypatch.setattr(server, "record_contact", failing_record_contact)
+    contact = {"name": "Jane", "email": "jane@example.com", "subject": "Hi", "message": "Hello"}
+    headers = {"Idempotency-Key": "retry-2"}
+    first = await api.post("/api/contact", json=contact, headers=headers)
+    server.contact_dedup._recent.clear()
+    retry = await api.post("/api/contact", json=contact, headers=headers)
+
+    assert first.status_code == retry.status_code == 200
+    assert retry.json()["data"] == first.json()["data"]
+    assert await mongo.contacts.count_documents({}) == 1
+
+
+async def test_contact_abandoned_claim_is_taken_over(api, mongo):
+    contact = {"name": "Jane", "email": "jane@example.com", "subject": "Hi", "message": "Hello"}
+    keys = server.contact_dedup.keys(contact, "crashed")
+    now = datetime.utcnow()
+    for key, ttl in keys:
+        await mongo.contact_dedup.insert_one({
+            "tenant_id": "default", "key": key, "content_key": keys[-1][0], "response": None,
+            "claimed_until": now + timedelta(seconds=30), "expires_at": now + timedelta(seconds=ttl),
+        })
+
+    response = await api.post("/api/contact", json=contact, headers={"Idempotency-Key": "crashed"})
+    assert response.status_code == 409
+
+    await mongo.contact_dedup.update_many({}, {"$set": {"claimed_until": now - timedelta(seconds=1)}})
+    response = await api.post("/api/contact", json=contact, headers={"Idempotency-Key": "crashed"})
+    assert response.status_code == 200
+    assert await mongo.contacts.count_documents({}) == 1
+
+
+async def test_contact_stored_but_not_completed_is_replayed_after_lease(api, mongo, monkeypatch):
+    async def failing_complete(*args, **kwargs):
+        raise RuntimeError("dedup write failed")
+
+    contact = {"name": "Jane", "email": "jane@example.com", "subject": "Hi", "message": "Hello"}
+    headers = {"Idempotency-Key": "half-done"}
+    with monkeypatch.context() as patch:
+        patch.setattr(server.contact_dedup, "complete", failing_complete)
+        first = await api.post("/api/contact", json=contact, headers=headers)
+    assert first.status_code == 200
+
+    past = datetime.utcnow() - timedelta(seconds=1)
+    await mongo.contact_dedup.update_many({}, {"$set": {"claimed_until": past}})
+    retry = await api.post("/api/contact", json=contact, headers=headers)
+
+    assert retry.status_code == 200
+    assert retry.json()["data"] == first.json()["data"]
+    assert await mongo.contacts.count_documents({}) == 1
+    replayed = await mongo.contact_dedup.find_one({"key": "key:half-done"})
+    assert replayed["response"] == first.json()["data"]
+
+
+async def test_contact_release_failure_still_returns_error(api, mongo, monkeypatch):
+    async def failing(*args, **kwargs):
+        raise RuntimeError("mongo down")
+
+    def failing_contact(**kwargs):
+        raise RuntimeError("invalid contact")
+
+    monkeypatch.setattr(server, "Contact", failing_contact)
+    monkeypatch.setattr(server.contact_dedup, "release", failing)
+    contact = {"name": "Jane", "email": "jane@example.com", "subject": "Hi", "message": "Hello"}
+    response = await api.post("/api/contact", json=contact)
+
+    assert response.status_code == 500
+    assert response.json()["detail"] == "Failed to submit contact form"
+
+
+async def test_contact_idempotency_key_reuse_with_other_payload_is_rejected(api, mongo):
+    contact = {"name": "Jane", "email": "jane@example.com", "subject": "Hi", "message": "Hello"}
+    headers = {"Idempotency-Key": "reused"}
+    assert (await api.post("/api/contact", json=contact, headers=headers)).status_code == 200
+
+    other = {**contact, "message": "Something else"}
+    assert (await api.post("/api/contact", json=other, headers=headers)).status_code == 422
+    server.contact_dedup._recent.clear()
+    assert (await api.post("/api/contact", json=other, headers=headers)).status_code == 422
+    assert await mongo.contacts.count_documents({}) == 1
+
+
+async def test_contact_post_validation(api):
+    response = await api.post("/api/contact", json={
+        "name": "Jane Doe", "email": "invalid-email", "subject": "Hi", "message": "Hello",
+    })
+    assert response.status_code == 422
+
+    response = await api.post("/api/contact", json={"name": "Jane Doe"})
+    assert response.status_code == 422
+
+
+async def test_stale_fallback_when_mongo_is_down(api, monkeypatch):
+    fresh = assert_success_list(await api.get("/api/projects"))
+
+    class Unavailable:
+        def __getitem__(self, name):
+            from pymongo.errors import ServerSelectionTimeoutError
+            raise ServerSelectionTimeoutError("mongo is down")
+
+    monkeypatch.setattr(server, "db", Unavailable())
+    response = await api.get("/api/projects")
+    assert response.headers["X-Served-Stale"] == "true"
+    assert assert_success_list(response) == fresh
+
+    response = await api.get("/api/education")
+    assert response.status_code == 500
+
+    health = (await api.get("/api/health")).json()["data"]
+    assert health["mongo_circuit"]["state"] == "open"
+
+
+async def test_stale_fallback_serves_only_validated_data(api, mongo, monkeypatch):
+    await mongo.projects.update_many({}, {"$set": {"internal_note": "not for clients"}})
+    await mongo.education.update_many({}, {"$set": {"institution": None}})
+    fresh = assert_success_list(await api.get("/api/projects"))
+    assert (await api.get("/api/education")).status_code == 500
+
+    class Unavailable:
+        def __getitem__(self, name):
+            from pymongo.errors import ServerSelectionTimeoutError
+            raise ServerSelectionTimeoutError("mongo is down")
+
+    monkeypatch.setattr(server, "db", Unavailable())
+    stale = assert_success_list(await api.get("/api/projects"))
+    assert stale == fresh
+    assert all("internal_note" not in project for project in stale)
+    assert (await api.get("/api/education")).status_code == 500
+
+
+async def test_health_reports_startup_phases(api):
+    await api.get("/api/")
+    startup = (await api.get("/api/health")).json()["data"]["startup_ms"]
+    assert 0 < startup["imported"] <= startup["app_created"] <= startup["first_request"]
+
+
+async def test_lifespan_creates_required_indexes_before_serving(mongo, monkeypatch):
+    monkeypatch.setattr(server, "shutdown_logging", lambda: None)
+    await mongo.drop_collection("contact_dedup")
+
+    app = server.create_app()
+    async with app.router.lifespan_context(app):
+        indexes = await mongo.contact_dedup.index_information()
+        assert indexes["tenant_id_1_key_1"]["unique"] is True
+
+
+async def test_lifespan_fails_fast_without_required_indexes(mongo, monkeypatch):
+    async def broken(db):
+        raise RuntimeError("index build failed")
+
+    async def unreachable(db):
+        await asyncio.sleep(60)
+
+    monkeypatch.setattr(server, "REQUIRED_INDEXES_TIMEOUT", 0.1)
+    for step, error in ((broken, RuntimeError), (unreachable, asyncio.TimeoutError)):
+        monkeypatch.setattr(server, "REQUIRED_INDEXES", (step,) + server.REQUIRED_INDEXES[1:])
+        app = server.create_app()
+        with pytest.raises(error):
+            async with app.router.lifespan_context(app):
+                pass
+
+
+async def test_changes_endpoint(api):
+    body = (await api.get("/api/changes")).json()["data"]
+    assert body["full_reload"] is True
+    assert len(body["projects"]["upserted"]) == 3
+    assert "JavaScript" in body["projects"]["upserted"][0]["technologies"]
+    version = body["version"]
+
+    body = (await api.get(f"/api/changes?since={to_version(datetime.utcnow())}")).json()["data"]
+    assert body["full_reload"] is False
+    assert body["projects"] == {"upserted": [], "deleted": []}
+
+    old_ids = {project["id"] for project in (await api.get("/api/projects")).json()["data"]}
+    await seed_data.seed_database()
+    new_ids = {project["id"] for project in (await api.get("/api/projects")).json()["data"]}
+
+    body = (await api.get(f"/api/changes?since={version}")).json()["data"]
+    assert set(body["projects"]["deleted"]) == old_ids
+    assert {project["id"] for project in body["projects"]["upserted"]} == new_ids
+
+    for since in ("yesterday", "99999999999999999", str(version + 60_000), "9999-01-01T00:00:00Z"):
+        response = await api.get(f"/api/changes?since={since}")
+        assert response.status_code == 400, since
+
+
+async def test_projects_batch_endpoint(api):
+    projects = (await api.get("/api/projects")).json()["data"]
+    ids = [projects[2]["id"], "missing-id", projects[0]["id"]]
+
+    response = await api.get("/api/projects/batch?ids=" + ",".join(ids))
+    body = response.json()
+    assert [p["id"] for p in body["data"]] == [ids[0], ids[2]]
+    assert body["missing"] == ["missing-id"]
+    assert body["unavailable"] == []
+    assert body["data"][0]["technologies"] == projects[2]["technologies"]
+
+    response = await api.post("/api/projects/batch", json={"ids": ids})
+    assert response.json()["data"] == body["data"]
+
+    response = await api.post("/api/projects/batch", json={"ids": [str(i) for i in range(101)]})
+    assert response.status_code == 400
+
+
+async def test_projects_batch_falls_back_to_cached_projects(api, monkeypatch):
+    projects = (await api.get("/api/projects")).json()["data"]
+    cached = (await api.get(f"/api/projects/{projects[0]['id']}")).json()["data"]
+
+    class Unavailable:
+        def __getitem__(self, name):
+            from pymongo.errors import ServerSelectionTimeoutError
+            raise ServerSelectionTimeoutError("mongo is down")
+
+    monkeypatch.setattr(server, "db", Unavailable())
+    response = await api.post("/api/projects/batch", json={"ids": [projects[0]["id"], projects[1]["id"]]})
+    assert response.headers["X-Served-Stale"] == "true"
+    assert response.json()["data"] == [cached]
+    assert response.json()["missing"] == []
+    assert response.json()["unavailable"] == [projects[1]["id"]]
+
+
+async def test_stats_skip_unknown_technology_ids(mongo):
+    project = await mongo.projects.find_one({"tenant_id": "default"})
+    await mongo.projects.update_one({"_id": project["_id"]}, {"$push": {"technology_ids": {"$each": [999] * 3}}})
+
+    counts = await stats_module.technology_counts(mongo, "default", server.tag_dictionary)
+    technologies = {row["name"]: row["count"] for row in counts}
+    assert technologies["ServiceNow"] == 2
+    assert technologies["JavaScript"] == 1
+    assert len(counts) == len(technologies)
+
+
+async def test_stats_endpoint(api, mongo):
+    stats = (await api.get("/api/stats")).json()["data"]
+    technologies = {row["name"]: row["count"] for row in stats["technologies"]}
+    assert technologies["ServiceNow"] == 2
+    assert stats["skills_per_category"] == {"serviceNow": 6, "technical": 7, "emerging": 6}
+    assert sum(stats["projects_by_status"].values()) == 3
+    assert stats["contacts_per_day"] == {}
+
+    contact = {"name": "Jane", "email": "jane@example.com", "subject": "Hi", "message": "Hello"}
+    await api.post("/api/contact", json=contact)
+    await api.post("/api/contact", json={**contact, "message": "Hello again"})
+
+    stats = (await api.get("/api/stats")).json()["data"]
+    assert list(stats["contacts_per_day"].values()) == [2]
+    assert list(stats["contacts_per_week"].values()) == [2]
+
+    refreshed = await stats_module.refresh_stats(mongo, "default", server.tag_dictionary)
+    assert refreshed["contacts_per_day"] == stats["contacts_per_day"]
+    assert refreshed["contacts_per_week"] == stats["contacts_per_week"]
@@ -0,0 +1,68 @@
+"""
+Per-endpoint latency budgets
+
+Opt-in: run with `pytest -m latency`. Each endpoint gets a warm-up request,
+then the median of several in-process requests is compared with its budget,
+so one slow request (first-call imports, a busy CI runner) does not fail
+the check.
+"""
+
+import os
+import statistics
+import time
+
+import pytest
+
+pytestmark = pytest.mark.latency
+
+# Median latency budgets in milliseconds, measured in-process
+LATENCY_BUDGETS_MS = {
+    "/api/": 50,
+    "/api/skills": 100,
+    "/api/projects": 100,
+    "/api/projects?technology=ServiceNow": 100,
+    "/api/projects/{id}": 100,
+    "/api/projects/batch?ids={id}": 100,
+    "/api/experience": 100,
+    "/api/education": 100,
+    "/api/certifications": 100,
+    "/api/contacts": 100,
+    "/api/stats": 100,
+    "/api/changes": 100,
+}
+# Scale budgets on slow machines, e.g. LATENCY_BUDGET_SCALE=3
+LATENCY_BUDGET_SCALE = float(os.environ.get('LATENCY_BUDGET_SCALE', '1'))
+SAMPLES = int(os.environ.get('LATENCY_SAMPLES', '9'))
+
+
+async def median_ms(api, method: str, path: str, **kwargs) -> float:
+    await api.request(method, path, **kwargs)  # Warm-up
+    timings = []
+    for _ in range(SAMPLES):
+        start = time.perf_counter()
+        response = await api.request(method, path, **kwargs)
+        timings.append((time.perf_counter() - start) * 1000)
+        assert response.status_code < 400
+    return statistics.median(timings)
+
+
+@pytest.mark.parametrize("path", list(LATENCY_BUDGETS_MS))
+async def test_get_within_budget(api, path):
+    project_id = (await api.get("/api/projects")).json()["data"][0]["id"]
+    elapsed_ms = await median_ms(api, "GET", path.replace("{id}", project_id))
+    budget_ms = LATENCY_BUDGETS_MS[path] * LATENCY_BUDGET_SCALE
+    assert elapsed_ms <= budget_ms, f"GET {path} median {elapsed_ms:.1f}ms, budget is {budget_ms:.0f}ms"
+
+
+async def test_contact_post_within_budget(api):
+    # Distinct messages so each submission is written rather than deduplicated
+    timings = []
+    for i in range(SAMPLES + 1):
+        contact = {"name": "Jane", "email": "jane@example.com", "subject": "Hi", "message": f"Hello {i}"}
+        start = time.perf_counter()
+        response = await api.post("/api/contact", json=contact)
+        timings.append((time.perf_counter() - start) * 1000)
+        assert response.status_code == 200
+    elapsed_ms = statistics.median(timings[1:])
+    budget_ms = 100 * LATENCY_BUDGET_SCALE
+    assert elapsed_ms <= budget_ms, f"POST /api/contact median {elapsed_ms:.1f}ms, budget is {budget_ms:.0f}ms"
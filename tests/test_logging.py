@@ -0,0 +1,65 @@
+"""
+Structured logging tests
+"""
+
+import json
+import logging
+import queue
+import sys
+
+import logging_config
+from logging_config import AccessLogSampler, JsonFormatter, NonBlockingQueueHandler, RequestIdFilter
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+def test_queue_handler_keeps_exc_info_for_listener():
+    handler = NonBlockingQueueHandler(queue.Queue())
+    logger = logging.getLogger("test_queue_handler")
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        record = logger.makeRecord(
+            logger.name, logging.ERROR, __file__, 0, "failed %s", ("job",), sys.exc_info()
+        )
+
+    prepared = handler.prepare(record)
+    assert prepared.msg == "failed job" and prepared.args is None
+    assert prepared.exc_info is not None
+
+    payload = json.loads(JsonFormatter().format(prepared))
+    assert payload["message"] == "failed job"
+    assert "ValueError: boom" in payload["exc_info"]
+
+
+def test_sampler_logs_everything_below_rate_then_samples(monkeypatch):
+    monkeypatch.setattr(logging_config.time, "monotonic", lambda: 1000.0)
+    sampler = AccessLogSampler(full_rps=3, sample_rate=0.5)
+    assert [sampler.should_log() for _ in range(7)] == [True, True, True, False, True, False, True]
+
+    monkeypatch.setattr(logging_config.time, "monotonic", lambda: 1001.0)
+    assert sampler.should_log() is True
+
+
+async def test_request_id_is_echoed_and_logged(api, monkeypatch):
+    monkeypatch.setattr(logging_config, "access_log_sampler", AccessLogSampler(full_rps=1000, sample_rate=1))
+    handler = ListHandler()
+    handler.addFilter(RequestIdFilter())
+    logging_config.access_logger.addHandler(handler)
+    try:
+        response = await api.get("/api/", headers={"X-Request-ID": "req-123"})
+        generated = await api.get("/api/")
+    finally:
+        logging_config.access_logger.removeHandler(handler)
+
+    assert response.headers["X-Request-ID"] == "req-123"
+    assert len(generated.headers["X-Request-ID"]) == 32
+    assert [r.request_id for r in handler.records] == ["req-123", generated.headers["X-Request-ID"]]
+    assert handler.records[0].status == 200 and handler.records[0].route == "/api/"
@@ -0,0 +1,52 @@
+"""
+Request profiling and slow query log tests
+"""
+
+import profiling
+from profiling import summarize_plan
+
+TOKEN = "secret-token"
+
+
+def test_summarize_plan_walks_find_stages():
+    plan = {"queryPlanner": {"winningPlan": {
+        "stage": "FETCH",
+        "inputStage": {"stage": "IXSCAN", "indexName": "tenant_id_1_id_1"},
+    }}}
+    assert summarize_plan(plan) == {"stages": ["FETCH", "IXSCAN"], "index": "tenant_id_1_id_1"}
+
+
+def test_summarize_plan_unwraps_aggregation_cursor():
+    plan = {"queryPlanner": {"winningPlan": {"queryPlan": {"stage": "COLLSCAN"}}}}
+    assert summarize_plan(plan) == {"stages": ["COLLSCAN"], "index": None}
+    assert summarize_plan({}) == {"stages": [], "index": None}
+
+
+async def test_admin_endpoints_require_token(api, monkeypatch):
+    monkeypatch.setattr(profiling, "PROFILE_TOKEN", TOKEN)
+    assert (await api.get("/api/admin/profiles")).status_code == 403
+    assert (await api.get("/api/admin/profiles", headers={"X-Profile-Token": "wrong"})).status_code == 403
+    assert (await api.get("/api/admin/slow-queries", headers={"X-Profile-Token": TOKEN})).status_code == 200
+
+    monkeypatch.setattr(profiling, "PROFILE_TOKEN", None)
+    assert (await api.get("/api/admin/profiles", headers={"X-Profile-Token": ""})).status_code == 403
+
+
+async def test_profile_id_round_trip(api, mongo, monkeypatch):
+    monkeypatch.setattr(profiling, "PROFILE_TOKEN", TOKEN)
+    headers = {"X-Profile-Token": TOKEN}
+    response = await api.get("/api/projects", headers=headers)
+    profile_id = response.headers["X-Profile-Id"]
+    assert await mongo.profiles.count_documents({"id": profile_id}) == 1
+
+    profiles = (await api.get("/api/admin/profiles", headers=headers)).json()["data"]
+    assert any(p["id"] == profile_id and p["path"] == "/api/projects" for p in profiles)
+    assert all("stats" not in p for p in profiles)
+
+    report = await api.get(f"/api/admin/profiles/{profile_id}?format=text", headers=headers)
+    assert report.status_code == 200
+    assert "cumulative" in report.text
+
+    download = await api.get(f"/api/admin/profiles/{profile_id}", headers=headers)
+    assert download.headers["content-type"] == "application/octet-stream"
+    assert (await api.get("/api/admin/profiles/missing", headers=headers)).status_code == 404
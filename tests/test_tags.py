@@ -0,0 +1,40 @@
+"""
+Tag dictionary tests
+"""
+
+import migrate_tags
+from tags import TagDictionary
+
+
+async def test_dangling_ids_reload_once_until_a_tag_is_created(mongo):
+    tags = TagDictionary()
+    known = await tags.ids_for(mongo, ["Python"])
+    loads = []
+    original_load = tags.load
+
+    async def counting_load(db):
+        loads.append(1)
+        await original_load(db)
+    tags.load = counting_load
+
+    assert await tags.names_for(mongo, known + [999]) == ["Python"]
+    assert await tags.names_for(mongo, [999] + known) == ["Python"]
+    assert len(loads) == 1
+
+    await tags.ids_for(mongo, ["Brand New Tag"])
+    await tags.names_for(mongo, [999])
+    assert len(loads) == 2
+
+
+async def test_migration_converts_name_lists_and_reruns(mongo, monkeypatch):
+    monkeypatch.setattr(migrate_tags, 'db', mongo)
+    monkeypatch.setattr(migrate_tags, 'tag_dictionary', TagDictionary())
+    await mongo.projects.insert_one({"id": "legacy", "tenant_id": "default", "technologies": ["Python", "Legacy Tool"]})
+
+    await migrate_tags.migrate_tags()
+    await migrate_tags.migrate_tags()
+
+    legacy = await mongo.projects.find_one({"id": "legacy"})
+    assert "technologies" not in legacy
+    names = await TagDictionary().names_for(mongo, legacy["technology_ids"])
+    assert names == ["Python", "Legacy Tool"]
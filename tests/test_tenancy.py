@@ -0,0 +1,123 @@
+"""
+Multi-tenant serving tests
+"""
+
+import seed_data
+import server
+import stats
+import tenancy
+from resilience import CircuitBreaker, StaleWhileErrorReader
+
+
+async def seed_acme(mongo):
+    await seed_data.seed_database("acme")
+    await mongo.projects.update_many({"tenant_id": "acme"}, {"$set": {"title": "Acme project"}})
+
+
+async def test_path_prefix_selects_tenant(api, mongo):
+    await seed_acme(mongo)
+
+    default = (await api.get("/api/projects")).json()["data"]
+    acme = (await api.get("/t/acme/api/projects")).json()["data"]
+    assert {p["title"] for p in acme} == {"Acme project"}
+    assert "Acme project" not in {p["title"] for p in default}
+    assert {p["id"] for p in acme}.isdisjoint(p["id"] for p in default)
+    assert all("tenant_id" not in p for p in acme)
+
+
+async def test_host_selects_tenant(api, mongo, monkeypatch):
+    await seed_acme(mongo)
+    monkeypatch.setattr(tenancy, "TENANT_BASE_DOMAIN", "portfolios.test")
+
+    response = await api.get("/api/projects", headers={"Host": "acme.portfolios.test"})
+    assert {p["title"] for p in response.json()["data"]} == {"Acme project"}
+
+
+async def test_unknown_tenant_is_empty_and_invalid_tenant_is_404(api):
+    response = await api.get("/t/nobody/api/projects")
+    assert response.json()["data"] == []
+
+    response = await api.get("/t/Not_Valid/api/projects")
+    assert response.status_code == 404
+
+
+async def test_contacts_are_tenant_scoped(api):
+    contact = {"name": "Jane", "email": "jane@example.com", "subject": "Hi", "message": "Hello"}
+    assert (await api.post("/t/acme/api/contact", json=contact)).status_code == 200
+
+    assert (await api.get("/api/contacts")).json()["data"] == []
+    acme = (await api.get("/t/acme/api/contacts")).json()["data"]
+    assert [c["email"] for c in acme] == ["jane@example.com"]
+
+
+async def test_stale_cache_evicts_fairly_across_tenants():
+    reader = StaleWhileErrorReader(
+        CircuitBreaker("test", 1, 60), timeout_ms=1000, max_entries=3, max_per_tenant=3
+    )
+
+    async def fetch():
+        return "value"
+
+    for tenant, keys in (("busy", "abcde"), ("quiet", "x")):
+        token = tenancy.current_tenant_var.set(tenant)
+        for key in keys:
+            await reader.read(key, fetch)
+        tenancy.current_tenant_var.reset(token)
+
+    # The busy tenant is capped at its quota and gives up entries to the quiet one
+    assert list(reader._last_good["busy"]) == ["d", "e"]
+    assert list(reader._last_good["quiet"]) == ["x"]
+
+
+async def test_filter_spam_does_not_evict_fallback_data(api, monkeypatch):
+    reader = StaleWhileErrorReader(
+        CircuitBreaker("test", 1, 60), timeout_ms=1000, max_entries=100, max_per_tenant=3
+    )
+    monkeypatch.setattr(server, "db_reads", reader)
+    await api.get("/api/skills")
+    await api.get("/api/projects")
+    for technology in ("ServiceNow", "JavaScript", "Python", "MRVS", "nope-1", "nope-2"):
+        await api.get(f"/api/projects?technology={technology}")
+
+    assert list(reader._last_good["default"]) == ["skills", "projects"]
+    # Unknown filters return [] and are not remembered; known ones are capped apart
+    assert list(reader._last_good["default:filtered"]) == ["projects:JavaScript", "projects:Python", "projects:MRVS"]
+
+
+async def test_batch_reads_do_not_evict_fallback_data(api, monkeypatch):
+    reader = StaleWhileErrorReader(
+        CircuitBreaker("test", 1, 60), timeout_ms=1000, max_entries=100, max_per_tenant=2
+    )
+    monkeypatch.setattr(server, "db_reads", reader)
+    await api.get("/api/skills")
+    projects = (await api.get("/api/projects")).json()["data"]
+    await api.post("/api/projects/batch", json={"ids": [project["id"] for project in projects]})
+    await api.get(f"/api/projects/{projects[0]['id']}")
+
+    assert list(reader._last_good["default"]) == ["skills", "projects"]
+    assert list(reader._last_good["default:items"]) == [f"project:{projects[2]['id']}", f"project:{projects[0]['id']}"]
+
+
+async def test_tags_are_tenant_scoped(api, mongo):
+    default = (await api.get("/api/tags")).json()["data"]
+    assert "ServiceNow" in {tag["name"] for tag in default}
+    assert (await api.get("/t/acme/api/tags")).json()["data"] == []
+
+    await mongo.projects.insert_one({"id": "p1", "tenant_id": "acme", "technology_ids": [default[0]["id"]]})
+    assert (await api.get("/t/acme/api/tags")).json()["data"] == [default[0]]
+
+
+async def test_unknown_tenants_do_not_grow_stats(api, mongo, monkeypatch):
+    monkeypatch.setattr(stats, 'stats_cache', stats.StatsCache(ttl=60, max_entries=2))
+    before = await mongo.stats.count_documents({})
+    for tenant in ("ghost1", "ghost2", "ghost3"):
+        data = (await api.get(f"/t/{tenant}/api/stats")).json()["data"]
+        assert data["technologies"] == [] and data["contacts_per_day"] == {}
+    assert await mongo.stats.count_documents({}) == before
+    assert len(stats.stats_cache._entries) == 0
+
+    await seed_acme(mongo)
+    for tenant in ("default", "acme", "default"):
+        await api.get(f"/t/{tenant}/api/stats")
+    stats.stats_cache.set("third", {})
+    assert list(stats.stats_cache._entries) == ["default", "third"]
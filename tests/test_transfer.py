@@ -0,0 +1,61 @@
+"""
+Bulk import/export tests
+"""
+
+import gzip
+import json
+
+import pytest
+from mongomock_motor import AsyncMongoMockClient
+
+import transfer
+
+
+async def test_export_then_import_round_trips(mongo, monkeypatch, tmp_path):
+    monkeypatch.setattr(transfer, "db", mongo)
+    for collection in transfer.ALL_COLLECTIONS:
+        await transfer.export_collection(collection, tmp_path, batch_size=2)
+
+    target = AsyncMongoMockClient()["portfolio_import"]
+    monkeypatch.setattr(transfer, "db", target)
+    checkpoint = transfer.Checkpoint(tmp_path / "checkpoint.json")
+    for collection in transfer.ALL_COLLECTIONS:
+        await transfer.import_collection(collection, tmp_path, batch_size=2, checkpoint=checkpoint)
+
+    for collection in transfer.ALL_COLLECTIONS:
+        assert await target[collection].find().to_list(None) == await mongo[collection].find().to_list(None)
+    assert json.loads((tmp_path / "checkpoint.json").read_text())["projects"]["lines"] == 3
+
+
+async def test_import_resumes_from_checkpoint(mongo, monkeypatch, tmp_path):
+    monkeypatch.setattr(transfer, "db", mongo)
+    await transfer.export_collection("projects", tmp_path, batch_size=100)
+
+    target = AsyncMongoMockClient()["portfolio_import"]
+    monkeypatch.setattr(transfer, "db", target)
+    dump = transfer.dump_path(tmp_path, "projects")
+    (tmp_path / "checkpoint.json").write_text(json.dumps(
+        {"projects": {"lines": 2, "file": transfer.fingerprint(dump)}}
+    ))
+    checkpoint = transfer.Checkpoint(tmp_path / "checkpoint.json")
+
+    imported = await transfer.import_collection("projects", tmp_path, batch_size=100, checkpoint=checkpoint)
+    assert imported == 1
+    assert await target.projects.count_documents({}) == 1
+    assert checkpoint.get("projects", dump) == 3
+
+
+async def test_import_refuses_checkpoint_for_changed_dump(mongo, monkeypatch, tmp_path):
+    monkeypatch.setattr(transfer, "db", mongo)
+    await transfer.export_collection("projects", tmp_path, batch_size=100)
+    dump = transfer.dump_path(tmp_path, "projects")
+    checkpoint = transfer.Checkpoint(tmp_path / "checkpoint.json")
+    checkpoint.save("projects", dump, 2)
+
+    with gzip.open(dump, "at", encoding="utf-8") as out:
+        out.write("\n")
+    target = AsyncMongoMockClient()["portfolio_import"]
+    monkeypatch.setattr(transfer, "db", target)
+    with pytest.raises(transfer.CheckpointMismatch):
+        await transfer.import_collection("projects", tmp_path, batch_size=100, checkpoint=checkpoint)
+    assert await target.projects.count_documents({}) == 0